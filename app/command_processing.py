@@ -10,6 +10,7 @@ Jarvis: разбор фраз, поиск совпадений с именем 
 from typing import Any, Dict, List
 
 import asyncio
+import re
 from rapidfuzz import fuzz
 
 import jarvis_skills
@@ -42,6 +43,14 @@ VA_TBR = (
     "слушай",
 )
 
+# Имя ассистента отдельным словом: одна проверка regex для всей фразы
+# вместо fuzzy-сравнения каждого слова в самом частом случае.
+_ACTIVATION_RE = re.compile(
+    r"(?<!\S)(?:" + "|".join(map(re.escape, VA_ALIAS)) + r")(?!\S)"
+)
+# Слово, начинающееся на «сто» («стоп», «стой»), считается командой остановки.
+_STOP_PREFIX_RE = re.compile(r"(?<!\S)сто")
+
 # Минимальная уверенность (0‑100) для выбора команды из конфигурации.
 CMD_CONFIDENCE_THRESHOLD = 70
 # Допустимая «похожесть» слова активации, если пользователь сказал его неточно.
@@ -177,7 +186,23 @@ async def filter_cmd(raw: str) -> str:
 
 def _matches_activation(word: str) -> bool:
     """Проверить, похоже ли слово на имя ассистента."""
-    return any(fuzz.ratio(word, alias) >= ACTIVATION_CONFIDENCE for alias in VA_ALIAS)
+    # ``score_cutoff`` позволяет rapidfuzz отбросить заведомо непохожие
+    # слова (например, слишком короткие) без полного расчёта.
+    return any(
+        fuzz.ratio(word, alias, score_cutoff=ACTIVATION_CONFIDENCE)
+        for alias in VA_ALIAS
+    )
+
+
+def contains_activation(text: str) -> bool:
+    """Определить, есть ли во фразе слово, похожее на имя ассистента.
+
+    Точное имя находится одним проходом regex; только если его нет,
+    слова проверяются нечётким сравнением.
+    """
+    if _ACTIVATION_RE.search(text):
+        return True
+    return any(_matches_activation(w) for w in text.split())
 
 
 def extract_cmd(text: str) -> str:
@@ -217,12 +242,12 @@ def contains_stop(text: str) -> bool:
 
     Используется для прерывания речи синтезатора даже без слова активации.
     """
-    words = text.lower().split()
-    for word in words:
-        if word.startswith("ст"):
-            if word.startswith("сто") or fuzz.ratio(word, "стоп") >= 75:
-                return True
-        elif fuzz.ratio(word, "стоп") >= 80:
+    text = text.lower()
+    if _STOP_PREFIX_RE.search(text):
+        return True
+    for word in text.split():
+        cutoff = 75 if word.startswith("ст") else 80
+        if fuzz.ratio(word, "стоп", score_cutoff=cutoff):
             return True
     return False
 
@@ -45,10 +45,10 @@ def idle_scan(
     )
 
     if mode == "sine":
-        pattern = [
-            amplitude * math.sin(2 * math.pi * frequency * t / length)
-            for t in range(length)
-        ]
+        # Угловой шаг вычисляем один раз, а не на каждой точке
+        omega = 2 * math.pi * frequency / length
+        sin = math.sin
+        pattern = [amplitude * sin(omega * t) for t in range(length)]
     elif mode == "triangle":
         pattern = []
         period = length / frequency
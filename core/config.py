@@ -177,11 +177,19 @@ def load_config(path: str = "config.ini") -> AppConfig:
     rotation = parser.getint("PRESENCE", "frame_rotation", fallback=270)
     if rotation not in (0, 90, 180, 270):
         raise ConfigError("frame_rotation must be 0/90/180/270")
+    # Отладочное окно можно выключить переменной окружения без правки
+    # config.ini (например, на рабочем стенде без дисплея).
+    show_window_raw = _env_or_cfg(
+        parser, "PRESENCE", "show_window", "PRESENCE_SHOW_WINDOW", default="true"
+    )
+    show_window = ConfigParser.BOOLEAN_STATES.get(show_window_raw.strip().lower())
+    if show_window is None:
+        raise ConfigError(f"Invalid boolean for show_window: '{show_window_raw}'")
     presence = PresenceConfig(
         enabled=parser.getboolean("PRESENCE", "enabled"),
         camera_index=parser.getint("PRESENCE", "camera_index"),
         frame_interval_ms=parser.getint("PRESENCE", "frame_interval_ms"),
-        show_window=parser.getboolean("PRESENCE", "show_window", fallback=True),
+        show_window=show_window,
         frame_rotation=rotation,
     )
 
@@ -14,11 +14,13 @@ from __future__ import annotations
 
 import logging
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 import os
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from context import long_term, short_term
 from memory import long_memory, preferences
@@ -38,6 +40,18 @@ PROFILES = {
 # Базовый URL локального сервера Ollama
 BASE_URL = "http://localhost:11434"
 
+# Сколько сервер держит модель в памяти после запроса. По умолчанию Ollama
+# выгружает её через 5 минут простоя, и следующий вопрос ждёт повторной
+# загрузки весов. Значение передаётся как есть (например, "30m" или "-1").
+KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+# Общая HTTP-сессия: соединение с локальным сервером Ollama остаётся
+# открытым (keep-alive) между запросами, и каждый вызов не платит за новое
+# TCP-подключение. Запросы могут идти из нескольких потоков, поэтому пул
+# рассчитан на несколько соединений.
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 
 def _query_ollama(prompt: str, profile: str, trace_id: str = "") -> str:
     """Отправить HTTP-запрос к Ollama и вернуть ответ.
@@ -50,12 +64,14 @@ def _query_ollama(prompt: str, profile: str, trace_id: str = "") -> str:
         raise ValueError(f"Неизвестный профиль: {profile}")
     model = PROFILES[profile]
 
-    # Подготавливаем запрос для современного эндпоинта /v1/chat/completions
-    url = f"{BASE_URL}/v1/chat/completions"
+    # Подготавливаем запрос для нативного эндпоинта /api/chat: в отличие от
+    # OpenAI-совместимого /v1/chat/completions он принимает ``keep_alive``
+    url = f"{BASE_URL}/api/chat"
     payload = {
         "model": model,
         "messages": [{"role": "user", "content": prompt}],
         "stream": False,  # просим сервер вернуть единый JSON без чанков
+        "keep_alive": KEEP_ALIVE,
     }
 
     # trace_id не обязателен для сервера, но полезен для сопоставления логов,
@@ -68,7 +84,7 @@ def _query_ollama(prompt: str, profile: str, trace_id: str = "") -> str:
     )
 
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=60)
+        response = _session.post(url, json=payload, headers=headers, timeout=60)
     except requests.RequestException as exc:
         # Сетевые ошибки: сервер недоступен или таймаут
         logger.error("Ошибка при обращении к Ollama: %s", exc)
@@ -91,10 +107,10 @@ def _query_ollama(prompt: str, profile: str, trace_id: str = "") -> str:
             )
             raise RuntimeError(f"Модель {model} не найдена")
 
-        # Старые версии Ollama не знают про /v1/chat/completions.
+        # Старые версии Ollama не знают про /api/chat.
         # Логируем предупреждение и пробуем fallback на /api/generate.
         logger.warning(
-            "Эндпоинт /v1/chat/completions не найден, пробуем /api/generate",
+            "Эндпоинт /api/chat не найден, пробуем /api/generate",
             extra={"trace_id": trace_id},
         )
         url = f"{BASE_URL}/api/generate"
@@ -102,9 +118,10 @@ def _query_ollama(prompt: str, profile: str, trace_id: str = "") -> str:
             "model": model,
             "prompt": prompt,
             "stream": False,
+            "keep_alive": KEEP_ALIVE,
         }
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=60)
+            response = _session.post(url, json=payload, headers=headers, timeout=60)
         except requests.RequestException as exc:
             logger.error("Ошибка при обращении к Ollama: %s", exc)
             raise RuntimeError("Ollama недоступна") from exc
@@ -143,11 +160,10 @@ def _query_ollama(prompt: str, profile: str, trace_id: str = "") -> str:
             # Ответ старого API: {"response": "текст"}
             text = str(data.get("response", ""))
         else:
-            # Новый формат: {"choices": [{"message": {"content": "текст"}}]}
-            choices = data.get("choices")
-            if not isinstance(choices, list) or not choices:
-                raise KeyError("choices")
-            message = choices[0].get("message", {})
+            # Ответ /api/chat: {"message": {"role": "assistant", "content": "текст"}}
+            message = data.get("message")
+            if message is None:
+                raise KeyError("message")
             if not isinstance(message, dict):
                 raise TypeError("message should be dict")
             text = str(message.get("content", ""))
@@ -162,8 +178,9 @@ def _query_ollama(prompt: str, profile: str, trace_id: str = "") -> str:
     return text
 
 
+@lru_cache(maxsize=None)
 def _load_prompt(name: str) -> str:
-    """Загрузить шаблон с диска."""
+    """Загрузить шаблон с диска (один раз на процесс)."""
     path = PROMPTS_DIR / f"{name}.txt"
     return path.read_text(encoding="utf-8")
 
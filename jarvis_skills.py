@@ -10,6 +10,7 @@ PATTERNS сравниваются по fuzzy-ratio; handle(text) вызывае
 если совпадение > THRESHOLD.
 """
 
+import re
 import sys
 import time
 import types
@@ -45,7 +46,8 @@ SKILLS_DIR    = Path(__file__).parent / "skills"
 POLL_INTERVAL = 1.0   # частота проверки изменений (сек.)
 THRESHOLD     = 70    # минимальный % совпадения для вызова handle()
 
-_loaded: list[tuple[list[str], callable]] = []  # [(PATTERNS, handle), …]
+# [(PATTERNS, общий regex шаблонов, handle), …]
+_loaded: list[tuple[list[str], re.Pattern, callable]] = []
 _scheduled: dict[str, asyncio.Task] = {}
 
 # ─── Делаем пакет «skills», если его ещё нет ──────────────────────────────
@@ -60,12 +62,28 @@ def _path_to_module(path: Path) -> str:
     rel = path.relative_to(SKILLS_DIR.parent).with_suffix("")
     return ".".join(rel.parts)  # 'skills', 'weather_ru' → 'skills.weather_ru'
 
+def _literal_re(patterns: list[str]) -> re.Pattern:
+    """Общий regex скилла: любой шаблон целиком, ограниченный пробелами.
+
+    Если шаблон встречается в нормализованной реплике как отдельные слова,
+    его токены — подмножество токенов реплики, и ``token_set_ratio`` даст
+    100. Поэтому такой скилл можно выбрать одним проходом regex, не считая
+    расстояния Левенштейна. Отсутствие совпадения скилл не исключает —
+    дальше работает обычное fuzzy-сравнение.
+    """
+    return re.compile(
+        r"(?<!\S)(?:" + "|".join(map(re.escape, patterns)) + r")(?!\S)"
+    )
+
 def _register(mod):
-    """Кладёт PATTERNS/handle из *mod* в список _loaded."""
+    """Кладёт PATTERNS/handle из *mod* в список _loaded.
+
+    Общий regex шаблонов компилируется здесь один раз на загрузку скилла.
+    """
     pats = [normalize(p) for p in getattr(mod, "PATTERNS", [])]
     func = getattr(mod, "handle",   None)
     if pats and callable(func):
-        _loaded.append((pats, func))
+        _loaded.append((pats, _literal_re(pats), func))
 
 def _load_file(py_file: Path):
     """Импортирует (или пере-импортирует) файл-скилл и регистрирует его."""
@@ -95,8 +113,8 @@ def _watch_skills():
 
                 # 1) убираем устаревшие записи этого модуля
                 _loaded[:] = [
-                    (p, h) for (p, h) in _loaded
-                    if h.__module__ != mod_name
+                    entry for entry in _loaded
+                    if entry[2].__module__ != mod_name
                 ]
                 # 2) загружаем свежий код и регистрируем
                 _load_file(f)
@@ -129,15 +147,19 @@ def handle_utterance(text: str) -> bool:
     text_low = normalize(text).lower()
     best_func, best_score = None, 0
 
-    for patterns, func in _loaded:
+    # Шаблоны уже нормализованы (и приведены к нижнему регистру) в _register
+    for patterns, literal_re, func in _loaded:
+        if literal_re.search(text_low):
+            best_score, best_func = 100, func
+            break  # шаблон найден дословно — это точное совпадение
         for p in patterns:
-            p_low = p.lower()
-            score = max(
-                fuzz.ratio(text_low, p_low),           # полная строка
-                fuzz.token_set_ratio(text_low, p_low)  # порядок слов не важен
-            )
+            score = fuzz.ratio(text_low, p)                            # полная строка
+            if score < 100:
+                score = max(score, fuzz.token_set_ratio(text_low, p))  # порядок слов не важен
             if score > best_score:
                 best_score, best_func = score, func
+        if best_score >= 100:
+            break  # точнее совпасть уже нельзя — остальные скиллы не проверяем
 
     if best_score >= THRESHOLD and best_func:
         # Генерируем trace_id для связывания логов одного запроса
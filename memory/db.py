@@ -80,6 +80,10 @@ SCHEMA = [
     )
     """,
     """
+    -- Индекс для выборки последних записей контекста (ORDER BY ts DESC)
+    CREATE INDEX IF NOT EXISTS idx_context_items_ts ON context_items(ts)
+    """,
+    """
     -- Таблица для эпизодической памяти: хранит события с эмбеддингами
     CREATE TABLE IF NOT EXISTS episodic_memory (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -167,17 +171,57 @@ def decrypt(token: str) -> str:
     return data.decode("utf-8")
 
 
+# Файлы БД, для которых миграции уже выполнены в этом процессе. Подключение
+# открывается на каждый запрос (присутствие, таймеры, настроение), и
+# повторный прогон всех DDL был основной частью его стоимости.
+_MIGRATED: set[str] = set()
+
+
 def get_connection() -> sqlite3.Connection:
     """Вернуть подключение SQLite с миграциями и ротацией."""
+    key = str(DB_PATH)
+    # Если файл удалили, пустую базу нужно создать заново
+    fresh = not Path(DB_PATH).exists()
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
-    _migrate(conn)  # выполняем миграции при каждом подключении
+    _configure(conn)
+    if fresh or key not in _MIGRATED:
+        _enable_wal(conn)
+        _migrate(conn)  # миграции — один раз на файл БД за время работы
+        _MIGRATED.add(key)
     _rotate_events(conn)  # удаляем старые события
     _cleanup_timers(conn)  # удаляем истекшие таймеры
     conn.commit()
     return conn
 
 
+def _configure(conn: sqlite3.Connection) -> None:
+    """Облегчить синхронизацию для этого подключения.
+
+    ``synchronous`` не сохраняется в файле, поэтому задаётся на каждое
+    подключение; в режиме WAL значение ``NORMAL`` сохраняет целостность при
+    сбое и убирает fsync на каждом коммите.
+    """
+    try:
+        conn.execute("PRAGMA synchronous=NORMAL")
+    except sqlite3.OperationalError as exc:
+        logging.getLogger(__name__).debug("pragma skipped: %s", exc)
+
+
+def _enable_wal(conn: sqlite3.Connection) -> None:
+    """Перевести файл БД в режим журнала WAL.
+
+    Режим хранится в самом файле, поэтому достаточно одного раза при первом
+    открытии: чтение не блокирует запись, а фиксация дописывает журнал вместо
+    перезаписи страниц базы.
+    """
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.OperationalError as exc:
+        # База может быть занята другим подключением — работаем как есть
+        logging.getLogger(__name__).debug("pragma skipped: %s", exc)
+
+
 def _migrate(conn: sqlite3.Connection) -> None:
     """Прогоняем DDL-миграции, игнорируя уже применённые шаги."""
     for ddl in SCHEMA:
@@ -31,6 +31,17 @@ _driver = None
 _last_sent_ms: float | None = None
 _tracking_active = False
 
+# Зона нечувствительности для track-команд: если смещение изменилось меньше
+# чем на ``TRACK_DEADBAND_PX`` по обеим осям и с прошлой отправки прошло
+# меньше ``TRACK_MAX_SILENCE_MS``, пакет не отправляется — серво всё равно
+# не сдвинется, а канал к M5 не забивается повторами. Сравнение идёт с
+# отдельно сохранёнными значениями последнего отправленного пакета, сам
+# пакет после ``draw`` не читается и не меняется.
+TRACK_DEADBAND_PX = 0.5
+TRACK_MAX_SILENCE_MS = 150
+_last_track_dx: float | None = None
+_last_track_dy: float | None = None
+
 
 @dataclass
 class _State:
@@ -53,7 +64,8 @@ class FaceTracker:
     # ------------------------------------------------------------------
     def update(self, point: Optional[Tuple[float, float]],
                frame_width: float = 1.0,
-               frame_height: float = 1.0) -> None:
+               frame_height: float = 1.0,
+               now: float | None = None) -> None:
         """Обновляет положение лица и управляет сервоприводами.
 
         :param point: относительные координаты центра лица ``(x, y)``.
@@ -61,6 +73,8 @@ class FaceTracker:
             потеряно и серво необходимо остановить.
         :param frame_width: ширина кадра в пикселях (для track-команды).
         :param frame_height: высота кадра в пикселях.
+        :param now: момент кадра по ``time.monotonic()``; если не задан,
+            берётся текущее время.
         """
 
         global _last_sent_ms, _tracking_active  # pylint: disable=global-statement
@@ -90,44 +104,65 @@ class FaceTracker:
                   self.state.x, self.state.y)
 
         # Подготовка и отправка команды поворота
-        now_ms = time.monotonic() * 1000
+        if now is None:
+            now = time.monotonic()
+        now_ms = now * 1000
         dt_ms = 0 if _last_sent_ms is None else now_ms - _last_sent_ms
-        _last_sent_ms = now_ms
         dx_px = (self.state.x - 0.5) * frame_width
         dy_px = (self.state.y - 0.5) * frame_height
-        _send_track(dx_px, dy_px, int(dt_ms))
+        # dt_ms отсчитывается от последнего реально отправленного пакета
+        if _send_track(dx_px, dy_px, int(dt_ms)):
+            _last_sent_ms = now_ms
         _tracking_active = True
 
 
-def _send_track(dx_px: float, dy_px: float, dt_ms: int) -> None:
-    """Отправить команду слежения драйверу дисплея."""
+def _send_track(dx_px: float, dy_px: float, dt_ms: int) -> bool:
+    """Отправить команду слежения драйверу дисплея.
+
+    Возвращает ``True``, если пакет передан драйверу, и ``False``, если он
+    пропущен (зона нечувствительности) или драйвер недоступен.
+    """
 
-    global _driver  # pylint: disable=global-statement
+    global _driver, _last_track_dx, _last_track_dy  # pylint: disable=global-statement
+    dx = round(dx_px, 1)
+    dy = round(dy_px, 1)
+    if (
+        _last_track_dx is not None
+        and abs(dx - _last_track_dx) < TRACK_DEADBAND_PX
+        and abs(dy - _last_track_dy) < TRACK_DEADBAND_PX
+        and dt_ms < TRACK_MAX_SILENCE_MS
+    ):
+        return False
     if _driver is None and get_driver:
         try:
             _driver = get_driver()
         except Exception as exc:  # pylint: disable=broad-except
             log.debug("driver not ready: %s", exc)
-            return
+            return False
     if not _driver:
         log.debug("driver missing: track dx=%+.1f dy=%+.1f", dx_px, dy_px)
-        return
+        return False
     try:  # pragma: no cover - в тестах исключения не ожидаются
-        pkt = DisplayItem(kind="track",
-                          payload={"dx_px": round(dx_px, 1),
-                                   "dy_px": round(dy_px, 1),
-                                   "dt_ms": dt_ms})
-        _driver.draw(pkt)
+        # Каждый пакет — новый объект: драйверы хранят отправленные пакеты
+        # (очередь WebSocket, кэш повторной отправки Serial), и менять их
+        # после ``draw`` нельзя.
+        _driver.draw(
+            DisplayItem(kind="track", payload={"dx_px": dx, "dy_px": dy, "dt_ms": dt_ms})
+        )
+        _last_track_dx, _last_track_dy = dx, dy
         log.debug("WS → track dx=%+.1f dy=%+.1f dt=%d", dx_px, dy_px, dt_ms)
+        return True
     except Exception as exc:  # pylint: disable=broad-except
         log.exception("Ошибка отправки WS(track): %s", exc)
+        return False
 
 
 def _clear_track() -> None:
     """Отправить команду остановки трекинга."""
 
-    global _driver, _last_sent_ms  # pylint: disable=global-statement
+    global _driver, _last_sent_ms, _last_track_dx, _last_track_dy  # pylint: disable=global-statement
     _last_sent_ms = None
+    _last_track_dx = _last_track_dy = None
     if _driver is None and get_driver:
         try:
             _driver = get_driver()
@@ -9,19 +9,55 @@ from __future__ import annotations
 координаты и публикует события ``vision.face_tracker``.
 """
 
+import importlib
+import logging
+import os
+import queue
+import threading
 import time
 from dataclasses import dataclass
-from typing import Optional
-
-# OpenCV и MediaPipe могут отсутствовать в среде тестов, поэтому импортируем
-# их с защитой. В реальном окружении эти пакеты должны быть установлены
-# (см. ``requirements.txt``).
-try:  # pragma: no cover - тесты не используют реальную камеру
-    import cv2
-    import mediapipe as mp
-except Exception:  # pylint: disable=broad-except
-    cv2 = None  # type: ignore
-    mp = None  # type: ignore
+from typing import Any, Optional
+
+# OpenCV, MediaPipe и NumPy — тяжёлые нативные библиотеки (сотни мегабайт,
+# около секунды на импорт), поэтому загружаем их лениво при первом запуске
+# ``PresenceDetector.run`` (см. :func:`_lazy_imports`). ``_UNLOADED`` значит
+# «ещё не загружали», ``None`` — пакет недоступен (например, в тестах).
+_UNLOADED: Any = object()
+cv2: Any = _UNLOADED
+mp: Any = _UNLOADED
+np: Any = _UNLOADED
+
+# Число потоков OpenCV. На маленьких кадрах (см. ``INFERENCE_MAX_SIDE``)
+# накладные расходы пула потоков больше выигрыша, а сам пул конкурирует с
+# потоками MediaPipe. Для больших кадров значение можно поднять переменной
+# окружения ``JARVIS_CV_THREADS``.
+CV_NUM_THREADS = int(os.getenv("JARVIS_CV_THREADS", "1"))
+
+
+def _try_import(name: str) -> Any:
+    try:
+        return importlib.import_module(name)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def _lazy_imports() -> None:  # pragma: no cover - зависит от окружения
+    """Импортировать OpenCV, MediaPipe и NumPy, если это ещё не сделано.
+
+    Уже заданные значения (в том числе подменённые в тестах) не трогаем.
+    """
+
+    global cv2, mp, np  # pylint: disable=global-statement
+    if cv2 is _UNLOADED:
+        cv2 = _try_import("cv2")
+        if cv2 is not None:
+            cv2.setNumThreads(CV_NUM_THREADS)
+            cv2.setUseOptimized(True)
+    if mp is _UNLOADED:
+        mp = _try_import("mediapipe")
+    if np is _UNLOADED:
+        np = _try_import("numpy")
+
 
 from core.events import Event, publish
 from core.logging_json import configure_logging
@@ -31,6 +67,37 @@ from sensors import set_active, grant_consent
 # Логгер модуля. При включенном DEBUG выводится дополнительная диагностика.
 log = configure_logging(__name__)
 
+# Формат захвата камеры. MJPG сжимает кадры на стороне камеры и снижает
+# нагрузку на USB по сравнению с несжатым YUYV; для детекции лица
+# достаточно 640x480. Буфер драйвера в один кадр исключает чтение
+# устаревших кадров, когда обработка медленнее захвата.
+CAPTURE_FOURCC = "MJPG"
+CAPTURE_WIDTH = 640
+CAPTURE_HEIGHT = 480
+CAPTURE_BUFFER_SIZE = 1
+CAPTURE_FPS = 30
+
+# Максимальная длинная сторона кадра, подаваемого в MediaPipe. Модель всё
+# равно работает на входе 192x192, поэтому больший кадр лишь увеличивает
+# объём копирования и преобразования цвета. Координаты рамки лица
+# относительные, поэтому пересчитывать их после уменьшения не нужно.
+INFERENCE_MAX_SIDE = 320
+
+
+def _downscale(frame, max_side: int, dst=None):
+    """Уменьшить кадр так, чтобы длинная сторона не превышала *max_side*.
+
+    Если передан буфер *dst* подходящего размера, результат пишется в него;
+    иначе OpenCV выделяет новый массив. Используйте возвращаемое значение.
+    """
+
+    h, w = frame.shape[:2]
+    scale = max_side / max(h, w)
+    if scale >= 1.0:
+        return frame
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return cv2.resize(frame, size, dst=dst, interpolation=cv2.INTER_AREA)
+
 
 @dataclass
 class PresenceState:
@@ -41,6 +108,189 @@ class PresenceState:
     last_seen: float = 0.0  # время последнего обнаружения
 
 
+class _CaptureThread:
+    """Непрерывный захват кадров камеры в отдельном потоке.
+
+    ``cap.grab()`` блокируется на вводе-выводе камеры. Поток постоянно
+    вычитывает кадры из драйвера, но декодирует (``cap.retrieve()``) только
+    тот, что захвачен после запроса главного цикла: кадры, пришедшие пока
+    идёт детекция, отбрасываются без декодирования MJPG. Каждому кадру
+    присваивается возрастающий номер, чтобы один и тот же кадр не
+    обрабатывался дважды.
+    О новом кадре поток сообщает через :class:`threading.Condition`, так
+    что главный цикл спит в :meth:`latest`, а не опрашивает его.
+    Исключение в потоке захвата сохраняется и пробрасывается из
+    :meth:`latest`.
+    Камеру освобождает :meth:`release_device`: если поток ещё висит в
+    ``cap.grab()``, освобождение выполняет сам поток при выходе.
+    """
+
+    def __init__(self, cap, retry_sec: float = 0.01) -> None:
+        self._cap = cap
+        self.retry_sec = retry_sec
+        self._latest: tuple[int, float, object] | None = None
+        self._frame_id = 0
+        self._error: BaseException | None = None
+        self._cond = threading.Condition()
+        # Установлен, когда главный цикл ждёт новый кадр
+        self._wanted = threading.Event()
+        self._wanted.set()
+        self.stop_event = threading.Event()
+        self._stopped = False
+        self._release_on_exit = False
+        self._thread = threading.Thread(target=self._grab_loop, name="PresenceCapture", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _grab_loop(self) -> None:
+        try:
+            while not self.stop_event.is_set():
+                if not self._cap.grab():
+                    log.debug("Камера не вернула кадр, повтор через %.2f сек", self.retry_sec)
+                    time.sleep(self.retry_sec)
+                    continue
+                if not self._wanted.is_set():
+                    continue
+                ok, frame = self._cap.retrieve()
+                if not ok:
+                    continue
+                self._wanted.clear()
+                with self._cond:
+                    self._frame_id += 1
+                    self._latest = (self._frame_id, time.monotonic(), frame)
+                    self._cond.notify_all()
+        except BaseException as exc:  # pylint: disable=broad-except
+            # Передаём ошибку в главный цикл, иначе он будет ждать кадров вечно
+            with self._cond:
+                self._error = exc
+                self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._stopped = True
+                release = self._release_on_exit
+            if release:
+                self._cap.release()
+
+    def latest(
+        self, after_id: int = 0, timeout: float = 0.0
+    ) -> tuple[int, float, object] | None:
+        """Вернуть ``(frame_id, ts, frame)``, если есть кадр новее *after_id*.
+
+        Если такого кадра нет, ждёт его не дольше *timeout* секунд и
+        возвращает ``None`` по истечении времени.
+        """
+
+        def _ready() -> bool:
+            item = self._latest
+            return self._error is not None or (item is not None and item[0] > after_id)
+
+        with self._cond:
+            if not _ready():
+                self._wanted.set()
+                if timeout > 0:
+                    self._cond.wait_for(_ready, timeout)
+            if self._error is not None:
+                raise self._error
+            item = self._latest
+        if item is None or item[0] <= after_id:
+            return None
+        return item
+
+    def close(self) -> None:
+        self.stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def release_device(self) -> None:
+        """Освободить камеру, не вырывая её из-под ``cap.grab()``.
+
+        Если поток захвата ещё работает, ``cap.release()`` вызовет он сам
+        при выходе из цикла.
+        """
+
+        with self._cond:
+            if self._thread.is_alive() and not self._stopped:
+                self._release_on_exit = True
+                return
+        self._cap.release()
+
+
+class _DisplayThread:
+    """Показ отладочного окна в отдельном потоке.
+
+    ``cv2.imshow`` и ``cv2.waitKey`` прокачивают очередь событий GUI и
+    блокируют вызывающий поток. Главный цикл лишь кладёт кадр в очередь на
+    один элемент (более старый непоказанный кадр вытесняется), а отрисовкой
+    занимается этот поток. Нажатие ``q`` в окне выставляет
+    :attr:`stop_event`.
+    """
+
+    def __init__(self, window: str, poll_sec: float = 0.1) -> None:
+        self.window = window
+        self.poll_sec = poll_sec
+        self.stop_event = threading.Event()
+        self._frames: queue.Queue = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._loop, name="PresenceView", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def show(self, frame) -> None:
+        """Передать кадр для показа, не блокируя вызывающий поток."""
+
+        try:
+            self._frames.put_nowait(frame)
+        except queue.Full:
+            # Окно не успевает — заменяем непоказанный кадр свежим
+            try:
+                self._frames.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._frames.put_nowait(frame)
+            except queue.Full:
+                pass
+
+    def _loop(self) -> None:  # pragma: no cover - требуется GUI
+        while not self.stop_event.is_set():
+            try:
+                frame = self._frames.get(timeout=self.poll_sec)
+            except queue.Empty:
+                continue
+            cv2.imshow(self.window, frame)
+            if cv2.waitKey(1) & 0xFF == ord("q"):
+                log.info("Остановка детектора по нажатию 'q'")
+                self.stop_event.set()
+        cv2.destroyAllWindows()
+
+    def close(self) -> None:
+        self.stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def release_device(self) -> None:
+        """Освободить камеру, не вырывая её из-под ``cap.grab()``.
+
+        Если поток захвата ещё работает, ``cap.release()`` вызовет он сам
+        при выходе из цикла.
+        """
+
+        with self._cond:
+            if self._thread.is_alive() and not self._stopped:
+                self._release_on_exit = True
+                return
+        self._cap.release()
+
+
 class PresenceDetector:
     """Детектор присутствия с публикацией событий.
 
@@ -78,15 +328,8 @@ class PresenceDetector:
         if frame_rotation not in (0, 90, 180, 270):
             raise ValueError("frame_rotation must be 0/90/180/270")
         self.frame_rotation = frame_rotation
-        if cv2 is not None:
-            self._rotate_code = {
-                0: None,
-                90: cv2.ROTATE_90_CLOCKWISE,
-                180: cv2.ROTATE_180,
-                270: cv2.ROTATE_90_COUNTERCLOCKWISE,
-            }[frame_rotation]
-        else:  # pragma: no cover - отсутствует в тестах
-            self._rotate_code = None
+        # Код поворота OpenCV вычисляется в ``run`` после загрузки cv2
+        self._rotate_code: Optional[int] = None
 
         log.debug(
             "PresenceDetector init: camera=%s interval_ms=%s rotation=%s window=%s",
@@ -101,6 +344,21 @@ class PresenceDetector:
         self.tracker = FaceTracker(alpha=0.5)
         # Объект камеры OpenCV (инициализируется лениво)
         self._cap: Optional[cv2.VideoCapture] = None  # type: ignore
+        # Граф MediaPipe FaceDetection (инициализируется лениво и
+        # переиспользуется между запусками ``run``)
+        self._mp_face = None
+
+    # ------------------------------------------------------------------
+    def _resolve_rotate_code(self) -> Optional[int]:
+        """Код ``cv2.rotate`` для угла ``frame_rotation`` (``None`` для 0°)."""
+
+        if self.frame_rotation == 0:
+            return None
+        if self.frame_rotation == 90:
+            return cv2.ROTATE_90_CLOCKWISE
+        if self.frame_rotation == 180:
+            return cv2.ROTATE_180
+        return cv2.ROTATE_90_COUNTERCLOCKWISE
 
     # ------------------------------------------------------------------
     def _ensure_camera(self) -> bool:
@@ -111,6 +369,8 @@ class PresenceDetector:
 
         if self._cap is None and cv2 is not None:
             self._cap = cv2.VideoCapture(self.camera_index)
+            if self._cap.isOpened():
+                self._configure_camera()
         if self._cap is None or not self._cap.isOpened():  # pragma: no cover -
             # Защита от отсутствия камеры в тестовой среде
             log.error("Cannot open camera %s", self.camera_index)
@@ -118,15 +378,61 @@ class PresenceDetector:
         return True
 
     # ------------------------------------------------------------------
-    def _update_state(self, detected: bool) -> None:
+    def _release_camera(self) -> None:
+        """Освободить камеру, чтобы следующий ``run`` открыл её заново."""
+
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+    # ------------------------------------------------------------------
+    def _configure_camera(self) -> None:
+        """Запросить у драйвера формат MJPG, разрешение, частоту и короткий буфер.
+
+        Драйвер может проигнорировать любое из свойств (``set`` тогда
+        возвращает ``False``) — это не ошибка, камера работает в своём
+        формате по умолчанию.
+        """
+
+        props = (
+            (cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*CAPTURE_FOURCC)),
+            (cv2.CAP_PROP_FRAME_WIDTH, CAPTURE_WIDTH),
+            (cv2.CAP_PROP_FRAME_HEIGHT, CAPTURE_HEIGHT),
+            (cv2.CAP_PROP_BUFFERSIZE, CAPTURE_BUFFER_SIZE),
+            (cv2.CAP_PROP_FPS, CAPTURE_FPS),
+        )
+        for prop, value in props:
+            if not self._cap.set(prop, value):
+                log.debug("Camera ignored property %s=%s", prop, value)
+
+    # ------------------------------------------------------------------
+    def _ensure_face_detector(self):
+        """Вернуть граф FaceDetection, создавая его только при первом вызове.
+
+        Инициализация интерпретатора TFLite занимает порядка 100 мс, поэтому
+        граф живёт вместе с детектором, а не создаётся заново в ``run``.
+        """
+
+        if self._mp_face is None:
+            self._mp_face = mp.solutions.face_detection.FaceDetection(
+                model_selection=1, min_detection_confidence=0.55
+            )
+        return self._mp_face
+
+    # ------------------------------------------------------------------
+    def _update_state(self, detected: bool, now: float | None = None) -> None:
         """Обновление состояния присутствия.
 
         Применяет EMA и публикует событие при смене флага ``present``.
+        *now* — момент кадра по ``time.monotonic()``; если не задан,
+        берётся текущее время.
         """
 
         value = 1.0 if detected else 0.0
-        self.state.confidence = self.alpha * value + (1 - self.alpha) * self.state.confidence
-        now = time.monotonic()
+        # EMA в форме c += a * (v - c): та же формула, одно умножение
+        self.state.confidence += self.alpha * (value - self.state.confidence)
+        if now is None:
+            now = time.monotonic()
         if detected:
             self.state.last_seen = now
 
@@ -152,7 +458,7 @@ class PresenceDetector:
                     attrs={"present": self.state.present, "confidence": self.state.confidence},
                 )
             )
-        else:
+        elif log.isEnabledFor(logging.DEBUG):
             log.debug("Presence confidence=%.2f", self.state.confidence)
 
     # ------------------------------------------------------------------
@@ -163,17 +469,19 @@ class PresenceDetector:
         y: float | None = None,
         frame_width: float = 1.0,
         frame_height: float = 1.0,
+        now: float | None = None,
     ) -> None:
         """Обрабатывает результат детекции лица.
 
         Вызывается из ``run`` и упрощает тестирование — можно передавать
         фиктивные координаты без обращения к камере. При необходимости
-        можно указать размеры кадра для корректных track-команд.
+        можно указать размеры кадра для корректных track-команд и момент
+        захвата кадра *now*.
         """
 
-        self._update_state(detected)
+        self._update_state(detected, now)
         if detected and self.state.present:
-            self.tracker.update((x or 0.0, y or 0.0), frame_width, frame_height)
+            self.tracker.update((x or 0.0, y or 0.0), frame_width, frame_height, now)
         else:
             self.tracker.update(None)
 
@@ -181,9 +489,11 @@ class PresenceDetector:
     def run(self) -> None:  # pragma: no cover - в тестах камера отсутствует
         """Главный цикл захвата и обработки кадров."""
 
+        _lazy_imports()
         if cv2 is None or mp is None:
             log.error("OpenCV/MediaPipe не установлены — PresenceDetector не работает")
             return
+        self._rotate_code = self._resolve_rotate_code()
         if not self._ensure_camera():
             return
 
@@ -203,55 +513,112 @@ class PresenceDetector:
                 set_active("camera", True)
             except PermissionError:
                 log.error("Запуск камеры отклонён из-за отсутствия согласия")
+                self._release_camera()
                 return
 
-        mp_face = mp.solutions.face_detection.FaceDetection(model_selection=1, min_detection_confidence=0.55)
         dt = self.frame_interval_ms / 1000.0
-
+        viewer: _DisplayThread | None = None
+        capture = _CaptureThread(self._cap)
         try:
+            # Инициализация графа тоже внутри try: при ошибке камера и
+            # индикатор будут освобождены в ``finally``.
+            mp_face = self._ensure_face_detector()
+            if self.show_window:
+                viewer = _DisplayThread("presence")
+                viewer.start()
+            capture.start()
+            frame_id = 0
+            # Буферы уменьшенного, повёрнутого и RGB-кадра переиспользуются
+            # между итерациями: OpenCV пишет в них через ``dst``.
+            small_buf = rot_buf = rgb_buf = None
+            # Темп цикла задаётся сроками по монотонным часам: время
+            # обработки кадра вычитается из паузы, и ошибка не накапливается.
+            next_deadline = time.monotonic()
+            # Уровень логгера проверяем один раз, а не на каждом кадре
+            debug_log = log.isEnabledFor(logging.DEBUG)
             while True:
-                ret, frame_bgr = self._cap.read()
-                if not ret:
-                    log.debug("Камера не вернула кадр, повтор через %.2f сек", dt)
-                    time.sleep(dt)
+                # Спим до появления нового кадра; таймаут лишь страхует от
+                # зависшей камеры, старый кадр повторно не обрабатывается
+                item = capture.latest(frame_id, timeout=0.1)
+                if item is None:
                     continue
+                frame_id, frame_ts, frame_bgr = item
+                # Сначала уменьшаем кадр, затем поворачиваем и меняем порядок
+                # каналов уже на маленьком изображении: полноразмерный кадр
+                # поворачивается только для отладочного окна.
+                frame_small = _downscale(frame_bgr, INFERENCE_MAX_SIDE, small_buf)
+                if frame_small is not frame_bgr:
+                    small_buf = frame_small
                 if self._rotate_code is not None:
-                    frame_bgr = cv2.rotate(frame_bgr, self._rotate_code)
-                frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+                    rot_buf = cv2.rotate(frame_small, self._rotate_code, dst=rot_buf)
+                    frame_small = rot_buf
+                if rgb_buf is None or rgb_buf.shape != frame_small.shape:
+                    rgb_buf = np.empty_like(frame_small)
+                rgb_buf.flags.writeable = True
+                cv2.cvtColor(frame_small, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+                # Кадр только для чтения: MediaPipe обойдётся без своей копии
+                rgb_buf.flags.writeable = False
+                frame_rgb = rgb_buf
+                # Размер полного кадра после поворота
+                h, w = frame_bgr.shape[:2]
+                if self.frame_rotation in (90, 270):
+                    h, w = w, h
 
                 # Обнаруживаем лица на кадре
                 detections = mp_face.process(frame_rgb).detections
                 if detections:
-                    face = max(detections, key=lambda d: d.score[0])
+                    # Выбираем лицо с наибольшей уверенностью одним вызовом
+                    # NumPy вместо ``max`` с lambda в интерпретаторе.
+                    scores = np.fromiter(
+                        (d.score[0] for d in detections),
+                        dtype=np.float32,
+                        count=len(detections),
+                    )
+                    face = detections[int(scores.argmax())]
                     rel_bb = face.location_data.relative_bounding_box
                     cx = rel_bb.xmin + rel_bb.width / 2
                     cy = rel_bb.ymin + rel_bb.height / 2
-                    h, w = frame_bgr.shape[:2]
-                    log.debug(
-                        "Лицо обнаружено: cx=%.3f cy=%.3f w=%d h=%d", cx, cy, w, h
-                    )
-                    self.process_detection(True, cx, cy, w, h)
+                    if debug_log:
+                        log.debug(
+                            "Лицо обнаружено: cx=%.3f cy=%.3f w=%d h=%d", cx, cy, w, h
+                        )
+                    self.process_detection(True, cx, cy, w, h, now=frame_ts)
                 else:
-                    log.debug("Лицо не обнаружено на текущем кадре")
-                    self.process_detection(False)
+                    if debug_log:
+                        log.debug("Лицо не обнаружено на текущем кадре")
+                    self.process_detection(False, now=frame_ts)
 
-                # При необходимости показываем окно с изображением
-                if self.show_window:
+                # При необходимости передаём кадр в поток отладочного окна
+                if viewer is not None:
+                    if viewer.stop_event.is_set():
+                        break
+                    if self._rotate_code is not None:
+                        frame_bgr = cv2.rotate(frame_bgr, self._rotate_code)
                     if detections:
-                        h, w = frame_bgr.shape[:2]
                         x0 = int(rel_bb.xmin * w)
                         y0 = int(rel_bb.ymin * h)
                         x1 = int((rel_bb.xmin + rel_bb.width) * w)
                         y1 = int((rel_bb.ymin + rel_bb.height) * h)
                         cv2.rectangle(frame_bgr, (x0, y0), (x1, y1), (0, 255, 0), 2)
-                    cv2.imshow("presence", frame_bgr)
-                    if cv2.waitKey(1) & 0xFF == ord("q"):
-                        log.info("Остановка детектора по нажатию 'q'")
-                        break
+                    viewer.show(frame_bgr)
 
-                time.sleep(dt)
+                next_deadline += dt
+                remaining = next_deadline - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                else:
+                    # Обработка не укладывается в интервал — не копим долг
+                    next_deadline = time.monotonic()
         finally:
             # При завершении работы снимаем индикатор активности
             set_active("camera", False)
-            self._cap.release()
-            cv2.destroyAllWindows()
+            # Сначала останавливаем поток захвата, затем освобождаем камеру
+            capture.close()
+            if capture.is_alive():
+                log.warning("Поток захвата не остановился, камеру освободит он сам")
+            if self._cap is not None:
+                capture.release_device()
+                self._cap = None
+            if viewer is not None:
+                # Окно закрывается в потоке, который его создал
+                viewer.close()
@@ -14,16 +14,16 @@ PATTERNS = [
 
 
 def _format_counts(counts: List[int]) -> str:
-    parts = []
-    for hour, sec in enumerate(counts):
-        minutes = sec // 60
-        if minutes:
-            parts.append(f"{hour:02d}:00 — {minutes} мин")
-    return "; ".join(parts)
+    """Собрать строку «ЧЧ:00 — N мин» для часов, где есть хотя бы минута."""
+
+    return "; ".join(
+        f"{hour:02d}:00 — {sec // 60} мин"
+        for hour, sec in enumerate(counts)
+        if sec >= 60
+    )
 
 
 def handle(text: str) -> str:
     counts = load_last_aggregate() or aggregate_by_hour()
-    if not any(counts):
-        return "Нет данных об активности"
-    return _format_counts(counts)
+    # Пустая строка означает, что ни в одном часе не набралось и минуты
+    return _format_counts(counts) or "Нет данных об активности"
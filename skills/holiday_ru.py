@@ -8,6 +8,7 @@
 from __future__ import annotations
 
 import datetime as _dt
+from functools import lru_cache
 from typing import List
 
 import requests
@@ -19,9 +20,14 @@ PATTERNS = [
 ]
 
 
+# Список праздников на год не меняется, поэтому запрашиваем его один раз.
+# Ошибки lru_cache не кэширует — после сбоя сети следующий вызов повторит
+# запрос.
+@lru_cache(maxsize=4)
 def _get_holidays(year: int) -> List[dict]:
     url = f"https://date.nager.at/api/v3/PublicHolidays/{year}/RU"
-    resp = requests.get(url, timeout=10)
+    # Отдельные таймауты на соединение и чтение ответа
+    resp = requests.get(url, timeout=(3, 10))
     resp.raise_for_status()
     return resp.json()
 
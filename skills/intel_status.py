@@ -5,6 +5,9 @@ from __future__ import annotations
 # Стандартные библиотеки
 import json
 import logging
+import re
+import sqlite3
+from contextlib import closing
 from datetime import datetime
 from typing import List
 
@@ -26,18 +29,20 @@ PATTERNS = [
 
 LABEL = "note"
 
+# Фразы запроса отчёта; одно регулярное выражение проверяет их за один проход
+_REPORT_RE = re.compile("что (?:ты )?запомнил|события дня")
+
 
 def _format_ts(ts: int) -> str:
     """Преобразовать метку времени в строку."""
     return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
 
 
-def _get_last_presence() -> str | None:
+def _get_last_presence(conn: sqlite3.Connection) -> str | None:
     """Вернуть описание последней сессии присутствия."""
-    with get_connection() as conn:
-        row = conn.execute(
-            "SELECT start_ts, end_ts FROM presence_sessions ORDER BY id DESC LIMIT 1"
-        ).fetchone()
+    row = conn.execute(
+        "SELECT start_ts, end_ts FROM presence_sessions ORDER BY id DESC LIMIT 1"
+    ).fetchone()
     if row is None:
         return None
     start = _format_ts(int(row["start_ts"]))
@@ -48,12 +53,11 @@ def _get_last_presence() -> str | None:
     return f"{start} – {end}"
 
 
-def _get_last_context_items(limit: int = 3) -> List[str]:
+def _get_last_context_items(conn: sqlite3.Connection, limit: int = 3) -> List[str]:
     """Вернуть последние *limit* записей контекста."""
-    with get_connection() as conn:
-        rows = conn.execute(
-            "SELECT value FROM context_items ORDER BY ts DESC LIMIT ?", (limit,)
-        ).fetchall()
+    rows = conn.execute(
+        "SELECT value FROM context_items ORDER BY ts DESC LIMIT ?", (limit,)
+    ).fetchall()
     items: List[str] = []
     for row in rows:
         val = row["value"]
@@ -93,9 +97,12 @@ def handle(text: str) -> str:
         return "Запомнил"
 
     # ─── Режим отчёта о сохранённых записях ──────────────────────
-    if any(p in low for p in ["что ты запомнил", "что запомнил", "события дня"]):
-        presence = _get_last_presence()
-        items = _get_last_context_items()
+    if _REPORT_RE.search(low):
+        # Одно подключение на оба запроса: ``get_connection`` при каждом
+        # открытии прогоняет миграции и чистку таблиц.
+        with closing(get_connection()) as conn:
+            presence = _get_last_presence(conn)
+            items = _get_last_context_items(conn)
         events = get_events_by_label(LABEL)
         parts = []
         if presence:
@@ -21,6 +21,10 @@ PATTERNS: List[str] = [
 
 THRESHOLD = 60  # Порог fuzzy-совпадения (60%)
 
+# Начала фраз, при которых вместо размышления вызывается действие.
+# ``str.startswith`` принимает кортеж и проверяет все варианты за один вызов.
+_ACT_PREFIXES = ("сделай", "поставь", "запусти", "выполни")
+
 log = configure_logging("skills.ollama")
 
 
@@ -34,10 +38,7 @@ def handle(text: str, *, trace_id: str) -> str:
 
     lower = text.lower()
     try:
-        if any(
-            lower.startswith(cmd)
-            for cmd in ["сделай", "поставь", "запусти", "выполни"]
-        ):
+        if lower.startswith(_ACT_PREFIXES):
             # Команда пользователя подразумевает действие
             log.debug("handle → act", extra={"trace_id": trace_id, "text": text})
             reply = llm_engine.act(text, trace_id=trace_id)
@@ -18,6 +18,7 @@
 
 from __future__ import annotations
 import datetime as _dt
+from functools import lru_cache
 from typing import List
 
 from display import get_driver, DisplayItem
@@ -43,6 +44,11 @@ _TENS = {
 
 AUTO_UPDATE_INTERVAL = 30
 
+# Последняя строка, отправленная на дисплей. Время показывается с точностью
+# до минуты, а обновление идёт каждые 30 с, поэтому половина вызовов ничего
+# не меняет. Драйверы сами повторяют последний кадр при переподключении.
+_last_display: str | None = None
+
 def _num_to_words(n: int) -> str:
     """0‑59 → «двадцать пять»"""
     if 0 <= n < 20:
@@ -72,15 +78,25 @@ def _minutes_decl(m: int) -> str:
     return "минут"
 
 
+# Готовые таблицы для всех часов и минут: форматирование сводится к
+# индексированию кортежей.
+_NUM_WORDS_0_59 = tuple(_num_to_words(n) for n in range(60))
+_HOURS_DECL = tuple(_hours_decl(h) for h in range(24))
+_MINUTES_DECL = tuple(_minutes_decl(m) for m in range(60))
+
+
 def _format_time(now: _dt.datetime) -> str:
-    h, m = now.hour, now.minute
-    h_words = _num_to_words(h)
-    h_word = _hours_decl(h)
+    return _format_hm(now.hour, now.minute)
+
+
+@lru_cache(maxsize=24 * 60)
+def _format_hm(h: int, m: int) -> str:
+    """Время словами для часа *h* и минуты *m* (результат кэшируется)."""
+    h_words = _NUM_WORDS_0_59[h]
+    h_word = _HOURS_DECL[h]
     if m == 0:
         return f"{h_words} {h_word} ровно"
-    m_words = _num_to_words(m)
-    m_word = _minutes_decl(m)
-    return f"{h_words} {h_word} {m_words} {m_word}"
+    return f"{h_words} {h_word} {_NUM_WORDS_0_59[m]} {_MINUTES_DECL[m]}"
 
 def _format_time_display(now: _dt.datetime) -> str:
     return now.strftime("%d-%m %H:%M")
@@ -91,8 +107,12 @@ def handle(_: str) -> str:
 
 def auto_update():
     """Вызывается планировщиком — обновляем время на дисплее."""
+    global _last_display
     now = _dt.datetime.now()
     disp_str = _format_time_display(now)
+    if disp_str == _last_display:
+        return
+    _last_display = disp_str
     driver = get_driver()
     driver.draw(DisplayItem(
         kind="time",
@@ -18,9 +18,12 @@
 
 from __future__ import annotations
 import datetime as _dt
+import heapq
+import itertools
 import re
 import threading
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Tuple
 
@@ -52,15 +55,40 @@ PATTERNS = [
     "покажи напоминания",
 ]
 
-# Активные задачи: метка -> (Timer, тип, момент окончания)
+class _ScheduledTask:
+    """Запись планировщика; ``cancel`` работает как у ``threading.Timer``."""
+
+    __slots__ = ("label", "typ", "cancelled")
+
+    def __init__(self, label: str, typ: str) -> None:
+        self.label = label
+        self.typ = typ
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+# Активные задачи: метка -> (задача планировщика, тип, момент окончания)
 # тип: timer | alarm | reminder_timer | reminder_alarm
-_TIMERS: Dict[str, Tuple[threading.Timer, str, _dt.datetime]] = {}
+_TIMERS: Dict[str, Tuple[_ScheduledTask, str, _dt.datetime]] = {}
+
+# Очередь сроков (monotonic, порядковый номер, задача). Все задачи
+# обслуживает один поток вместо отдельного ``threading.Timer`` на каждую;
+# отменённые записи выбрасываются, когда доходят до вершины кучи.
+_QUEUE: list[tuple[float, int, _ScheduledTask]] = []
+_QUEUE_COND = threading.Condition()
+_QUEUE_SEQ = itertools.count()
+_scheduler_thread: threading.Thread | None = None
 
 # Сработавшие, но ещё не подтверждённые таймеры: метка -> (тип, событие остановки)
 _ALERTS: Dict[str, Tuple[str, threading.Event]] = {}
 
 # Путь к пользовательскому звуку будильника/напоминания
 _ALARM_WAV = Path(__file__).resolve().parent.parent / "audio" / "sfx" / "alarm.wav"
+# Декодированный WAV (сэмплы, частота): сигнал повторяется каждые 1,5 с до
+# подтверждения, поэтому файл читаем с диска один раз.
+_alarm_cache: tuple | None = None
 
 
 def _save_timer(label: str, typ: str, end: _dt.datetime) -> None:
@@ -80,6 +108,12 @@ def _remove_timer(label: str | None) -> None:
         else:
             conn.execute("DELETE FROM timers WHERE label=?", (label,))
 
+
+def _remove_timers(labels: list[str]) -> None:
+    """Удаляет несколько таймеров одной транзакцией."""
+    with get_connection() as conn:
+        conn.executemany("DELETE FROM timers WHERE label=?", [(l,) for l in labels])
+
 # Словарь единиц времени для перевода в секунды
 _UNITS = {
     "сек": 1,
@@ -124,36 +158,62 @@ _NUM_WORDS = {
 }
 
 
+# Готовые значения для одного слова или пары «десятки + единицы»
+# («двадцать пять», «сорок одна»): типичная фраза разбирается одним
+# обращением к словарю без цикла по словам.
+_COMPOUND_NUMBERS: Dict[str, int] = dict(_NUM_WORDS)
+_COMPOUND_NUMBERS.update(
+    {
+        f"{tens} {unit}": tens_val + unit_val
+        for tens, tens_val in _NUM_WORDS.items()
+        if tens_val >= 20
+        for unit, unit_val in _NUM_WORDS.items()
+        if 0 < unit_val < 10
+    }
+)
+
+
 def _words_to_number(chunk: str) -> int | None:
-    """Конвертирует "двадцать пять" → 25."""
-    numbers: list[int] = []
-    acc: int | None = None
-    for w in chunk.lower().split():
+    """Конвертирует "двадцать пять" → 25.
+
+    Возвращает первое число во фразе и прекращает разбор, как только оно
+    найдено. *chunk* ожидается уже в нижнем регистре и без крайних пробелов:
+    ``handle`` приводит фразу к нижнему регистру один раз, а ``_to_int``
+    обрезает пробелы.
+    """
+    val = _COMPOUND_NUMBERS.get(chunk)
+    if val is not None:
+        return val
+    acc: int | None = None  # десятки, ожидающие единиц
+    # Делим только по пробелам: «1.5» — не целое число, и подставлять
+    # вместо него «1» нельзя.
+    for w in chunk.split():
         if w.isdigit():
-            numbers.append(int(w))
-            acc = None
-            continue
+            return int(w)
         val = _NUM_WORDS.get(w)
         if val is None:
             if acc is not None:
-                numbers.append(acc)
-                acc = None
+                return acc
             continue
         if val < 10 and acc is not None and acc >= 20:
-            numbers.append(acc + val)
-            acc = None
-        elif val % 10 == 0 and val >= 20:
+            return acc + val
+        if val % 10 == 0 and val >= 20:
             acc = val
         else:
-            numbers.append(val)
-            acc = None
-    if acc is not None:
-        numbers.append(acc)
-    return numbers[0] if numbers else None
+            return val
+    return acc
 
 
-_DUR_RE = re.compile(r"(?:на|через)\s+(?P<num>[\dа-яё\s]+?)\s+(?P<unit>[а-я]+)")
+# Предлоги перед относительной длительностью («на 5 минут», «через час»)
+_DUR_PREFIX_RE = re.compile(r"(?<!\S)(?:на|через)\s+")
+_WORD_RE = re.compile(r"\S+")
+_PUNCT = ".,!?;:"
 _TIME_RE = re.compile(r"(?:в|на)\s*(?P<h>\d{1,2})(?:[:.\s](?P<m>\d{1,2}))?")
+# Время словами: «в семь тридцать», «на восемь часов пятнадцать минут»
+_TIME_WORDS_RE = re.compile(r"(?:в|на)\s+(.+)")
+_STOP_RE = re.compile(
+    r"(?:останови|отмени) (?:таймер|будильник|напоминание)(?: (?P<label>[\wа-я]+))?"
+)
 
 
 def _to_int(tok: str) -> int | None:
@@ -162,6 +222,9 @@ def _to_int(tok: str) -> int | None:
     return int(tok) if tok.isdigit() else _words_to_number(tok)
 
 
+_BEEP_INTERVAL = 1.5  # пауза между сигналами будильника, с
+
+
 def _beep(freq: int = 880, duration: float = 0.2) -> None:
     """Проигрывает звуковой сигнал.
 
@@ -179,7 +242,8 @@ def _beep(freq: int = 880, duration: float = 0.2) -> None:
     except Exception:
         return
 
-    if _ALARM_WAV.exists():
+    global _alarm_cache
+    if _alarm_cache is None and _ALARM_WAV.exists():
         try:
             import wave
 
@@ -189,31 +253,55 @@ def _beep(freq: int = 880, duration: float = 0.2) -> None:
                 data = _np.frombuffer(frames, dtype=_np.int16)
                 if wf.getnchannels() > 1:
                     data = data.reshape(-1, wf.getnchannels())
-                _sd.play(data, sample_rate)
-                _sd.wait()
-                return
+            _alarm_cache = (data, sample_rate)
         except Exception:
             pass  # при ошибке откатываемся к генерации синусоиды
+    if _alarm_cache is not None:
+        try:
+            _sd.play(*_alarm_cache)
+            _sd.wait()
+            return
+        except Exception:
+            pass
 
-    sample_rate = 44100  # частота дискретизации
-    t = _np.linspace(0, duration, int(sample_rate * duration), False)
-    tone = _np.sin(freq * 2 * _np.pi * t) * 0.2
-    _sd.play(tone, sample_rate)
+    _sd.play(_tone(freq, duration), _TONE_SAMPLE_RATE)
     _sd.wait()
 
 
+_TONE_SAMPLE_RATE = 44100  # частота дискретизации запасного сигнала
+
+
+@lru_cache(maxsize=None)
+def _tone(freq: int, duration: float):
+    """Синусоидальный сигнал; строится один раз на пару (частота, длительность)."""
+    import numpy as _np  # type: ignore
+
+    t = _np.linspace(0, duration, int(_TONE_SAMPLE_RATE * duration), False)
+    tone = _np.sin(freq * 2 * _np.pi * t) * 0.2
+    tone.flags.writeable = False  # буфер общий для всех вызовов
+    return tone
+
+
 def _speak(msg: str) -> None:
     """Озвучивает текст с помощью встроенного TTS."""
     from working_tts import working_tts
     working_tts(msg)
 
 
-def _fire(label: str, typ: str) -> None:
-    """Логика срабатывания таймера/будильника/напоминания."""
+def _fire(
+    label: str, typ: str, present: bool | None = None, remove: bool = True
+) -> None:
+    """Логика срабатывания таймера/будильника/напоминания.
+
+    *present* позволяет передать уже известное присутствие пользователя,
+    а ``remove=False`` оставляет удаление записи из БД вызывающему коду
+    (например, для пакетного удаления при восстановлении).
+    """
 
     log.info("timer fired: label=%s typ=%s", label, typ)
-    _TIMERS.pop(label, None)  # объект ``Timer`` больше не нужен
-    present = _user_present()
+    _TIMERS.pop(label, None)  # задача планировщика больше не нужна
+    if present is None:
+        present = _user_present()
     log.info("user_present=%s", present)
 
     if present:
@@ -238,7 +326,8 @@ def _fire(label: str, typ: str) -> None:
             msg = f"{kind} {label} сработал"
         log.info("sending telegram: %s", msg)
         _tg_send(msg)
-        _remove_timer(label)
+        if remove:
+            _remove_timer(label)
 
 
 def _user_present() -> bool:
@@ -253,19 +342,57 @@ def _user_present() -> bool:
 
 
 def _alert_loop(stop_event: threading.Event) -> None:
-    """Подает звуковые сигналы, пока таймер не будет остановлен."""
-    while not stop_event.is_set():
-        _beep()
-        time.sleep(1.5)
+    """Подает звуковые сигналы, пока таймер не будет остановлен.
+
+    Событие опрашивается каждые 0.1 с, поэтому «стоп» срабатывает почти
+    сразу, а между сигналами выдерживается пауза ``_BEEP_INTERVAL`` —
+    даже длинный WAV не приводит к сигналам «впритык».
+    """
+    last = 0.0
+    while not stop_event.wait(0.1):
+        if time.monotonic() - last >= _BEEP_INTERVAL:
+            _beep()
+            # Отсчитываем паузу от конца сигнала: _beep ждёт окончания WAV.
+            last = time.monotonic()
+
+
+def _scheduler_loop() -> None:
+    """Ждёт ближайший срок в очереди и запускает сработавшие задачи."""
+    while True:
+        with _QUEUE_COND:
+            while True:
+                while _QUEUE and _QUEUE[0][2].cancelled:
+                    heapq.heappop(_QUEUE)
+                if not _QUEUE:
+                    _QUEUE_COND.wait()
+                    continue
+                delay = _QUEUE[0][0] - time.monotonic()
+                if delay <= 0:
+                    task = heapq.heappop(_QUEUE)[2]
+                    break
+                _QUEUE_COND.wait(delay)
+        # Сигнал и озвучка занимают секунды — выполняем их в отдельном
+        # потоке, чтобы не задерживать остальные сроки.
+        threading.Thread(
+            target=_fire, args=(task.label, task.typ), daemon=True
+        ).start()
 
 
 def _schedule(seconds: int, label: str, typ: str, save: bool = True) -> None:
     """Создаёт и запускает таймер/будильник."""
-    t = threading.Timer(seconds, _fire, args=(label, typ))
-    t.daemon = True  # позволяет завершить программу с активными таймерами
+    global _scheduler_thread
+    task = _ScheduledTask(label, typ)
     end = _dt.datetime.now() + _dt.timedelta(seconds=seconds)
-    _TIMERS[label] = (t, typ, end)  # сохраняем для последующего управления
-    t.start()
+    _TIMERS[label] = (task, typ, end)  # сохраняем для последующего управления
+    with _QUEUE_COND:
+        heapq.heappush(_QUEUE, (time.monotonic() + seconds, next(_QUEUE_SEQ), task))
+        if _scheduler_thread is None:
+            # daemon позволяет завершить программу с активными таймерами
+            _scheduler_thread = threading.Thread(
+                target=_scheduler_loop, name="TimerScheduler", daemon=True
+            )
+            _scheduler_thread.start()
+        _QUEUE_COND.notify()
     if save:
         _save_timer(label, typ, end)
 
@@ -274,13 +401,24 @@ def _restore_from_db() -> None:
     """При старте восстанавливает активные и просроченные таймеры."""
     now = int(_dt.datetime.now().timestamp())
     with get_connection() as conn:
-        for row in conn.execute("SELECT label, typ, end_ts FROM timers"):
-            if row["end_ts"] > now:
-                sec = row["end_ts"] - now
-                _schedule(sec, row["label"], row["typ"], save=False)
-            else:
-                # Таймер уже истёк во время простоя программы
-                _fire(row["label"], row["typ"])
+        rows = conn.execute("SELECT label, typ, end_ts FROM timers").fetchall()
+    expired: list[tuple[str, str]] = []
+    for row in rows:
+        if row["end_ts"] > now:
+            sec = row["end_ts"] - now
+            _schedule(sec, row["label"], row["typ"], save=False)
+        else:
+            # Таймер уже истёк во время простоя программы
+            expired.append((row["label"], row["typ"]))
+    if not expired:
+        return
+    # Присутствие одно для всех просроченных задач; если пользователя нет,
+    # записи удаляем одним запросом, а не по одной в каждом ``_fire``.
+    present = _user_present()
+    for label, typ in expired:
+        _fire(label, typ, present=present, remove=False)
+    if not present:
+        _remove_timers([label for label, _ in expired])
 
 
 # При импорте навыка восстанавливаем незавершённые таймеры
@@ -288,26 +426,45 @@ _restore_from_db()
 
 
 def _parse_duration(text: str, default: str) -> Tuple[int, str] | None:
-    """Парсит относительную длительность таймера/напоминания."""
-    m = _DUR_RE.search(text)
-    if not m:
-        return None  # не нашли количество
-    num_token = m.group("num").strip()
-    unit = m.group("unit")
-    sec_per = _UNITS.get(unit)  # переводим единицу в секунды
-    if not sec_per:
-        return None
-    num = _to_int(num_token)
-    if num is None:
-        return None
-    sec = num * sec_per
-    # остаток строки после совпадения считаем меткой
-    label = text[m.end():].strip() or default
-    return sec, label
-
+    """Парсит относительную длительность таймера/напоминания.
 
-def _parse_time(text: str, default: str) -> Tuple[int, str] | None:
-    """Парсит абсолютное время для будильника/напоминания."""
+    Перебирает предлоги «на»/«через» (отдельными словами) и после каждого
+    ждёт только слова-числа, а затем единицу времени: число — между ними,
+    метка — всё после единицы. Если после предлога идёт другое слово
+    («на кухне»), пробуем следующий предлог.
+    """
+    for pm in _DUR_PREFIX_RE.finditer(text):
+        words: list[str] = []
+        for m in _WORD_RE.finditer(text, pm.end()):
+            # знаки препинания («5 мин.», «10 минут,») к единице не относятся
+            tok = m.group().strip(_PUNCT)
+            sec_per = _UNITS.get(tok)  # переводим единицу в секунды
+            if sec_per is None:
+                if tok.isdigit() or tok in _NUM_WORDS:
+                    words.append(tok)
+                    continue
+                break  # не число — это не длительность
+            if not words:
+                break  # единица без количества
+            num = _to_int(" ".join(words))
+            if num is None:
+                break
+            # остаток строки после единицы считаем меткой
+            label = text[m.end():].strip(_PUNCT + " ") or default
+            return num * sec_per, label
+    return None  # не нашли количество с единицей времени
+
+
+def _parse_time(
+    text: str, default: str, now: _dt.datetime | None = None
+) -> Tuple[int, str] | None:
+    """Парсит абсолютное время для будильника/напоминания.
+
+    *now* — момент, от которого отсчитывается срок; по умолчанию текущее
+    время.
+    """
+    if now is None:
+        now = _dt.datetime.now()
     m = _TIME_RE.search(text)
     h: int | None = None
     mnt: int = 0
@@ -321,7 +478,7 @@ def _parse_time(text: str, default: str) -> Tuple[int, str] | None:
             mnt = int(m.group("m") or 0)
             end_idx = m.end()
     if not m:
-        m2 = re.search(r"(?:в|на)\s+(.+)", text)
+        m2 = _TIME_WORDS_RE.search(text)
         if not m2:
             return None
         tokens = m2.group(1).split()
@@ -350,13 +507,11 @@ def _parse_time(text: str, default: str) -> Tuple[int, str] | None:
                     if idx < len(tokens) and tokens[idx].startswith("мин"):
                         idx += 1
         label = " ".join(tokens[idx:]).strip() or default
-        now = _dt.datetime.now()
         alarm = now.replace(hour=h, minute=mnt, second=0, microsecond=0)
         if alarm <= now:
             alarm += _dt.timedelta(days=1)
         sec = int((alarm - now).total_seconds())
         return sec, label
-    now = _dt.datetime.now()
     alarm = now.replace(hour=h, minute=mnt, second=0, microsecond=0)
     if alarm <= now:
         alarm += _dt.timedelta(days=1)
@@ -452,7 +607,7 @@ def handle(text: str) -> str:
     txt = text.lower()
     # остановка или отмена таймера/будильника/напоминания
     if "останови" in txt or "отмени" in txt:
-        m = re.search(r"(?:останови|отмени) (?:таймер|будильник|напоминание)(?: (?P<label>[\wа-я]+))?", txt)
+        m = _STOP_RE.search(txt)
         label = m.group("label") if m else None
         return _stop(label)
     # запрос списка активных задач
@@ -484,10 +639,12 @@ def handle(text: str) -> str:
         return f"Будильник {label} установлен"
     # установка напоминания
     if "напомни" in txt:
+        # Один момент «сейчас» и для расчёта срока, и для текста ответа
+        now = _dt.datetime.now()
         parsed = _parse_duration(txt, "напоминание")
         typ = "reminder_timer"
         if not parsed:
-            parsed = _parse_time(txt, "напоминание")
+            parsed = _parse_time(txt, "напоминание", now)
             typ = "reminder_alarm"
         if not parsed:
             return "Не понял время, повторите"
@@ -503,6 +660,6 @@ def handle(text: str) -> str:
             if sec >= 60:
                 return f"Напоминание {label} через {sec // 60} минут"
             return f"Напоминание {label} через {sec} секунд"
-        end = (_dt.datetime.now() + _dt.timedelta(seconds=sec)).strftime('%H:%M')
+        end = (now + _dt.timedelta(seconds=sec)).strftime('%H:%M')
         return f"Напоминание {label} на {end} установлено"
     return ""
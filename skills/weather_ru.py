@@ -10,12 +10,15 @@ from __future__ import annotations
 
 import datetime as _dt
 import os as _os
+import random as _random
 import re as _re
 import time as _time
+from concurrent.futures import ThreadPoolExecutor as _Executor, as_completed, wait
 from typing import Dict, Tuple
 
 import threading as _th
 import requests as _rq
+from requests.adapters import HTTPAdapter as _HTTPAdapter
 
 from display import DisplayItem, get_driver
 from core.logging_json import configure_logging
@@ -27,14 +30,32 @@ log = configure_logging(__name__)
 LAT: str = _os.getenv("WTTR_LAT", "53.37977235908946")
 LON: str = _os.getenv("WTTR_LON", "58.990413992217746")
 CITY: str = _os.getenv("JARVIS_CITY", "Магнитогорске")
-WTTR_TIMEOUT = 1           # сек
-OPENMETEO_TIMEOUT = 4      # сек
+# (подключение, чтение), сек: долгое соединение не съедает бюджет чтения
+WTTR_TIMEOUT = (0.5, 1.0)
+OPENMETEO_TIMEOUT = (0.5, 3.0)
+RETRY_ATTEMPTS = 3         # попыток на сетевую ошибку или таймаут
+RETRY_BASE_DELAY = 0.1     # сек, пауза растёт вдвое с каждой попыткой
 FORECAST_DAYS = 3
 AUTO_UPDATE_INTERVAL = 1800  # сек для дисплея
+CACHE_TTL = 900            # сек, после этого ответ скилла обновляет кэш
+HEDGE_DELAY = 0.3          # сек ожидания wttr.in до параллельного Open-Meteo
+
+# Общая HTTP-сессия: TLS-соединения с wttr.in и Open-Meteo остаются
+# открытыми между обновлениями, и повторный запрос не платит за новое
+# рукопожатие. Скилл и автообновление работают в разных потоках, поэтому
+# пул рассчитан на несколько соединений к каждому хосту.
+_session = _rq.Session()
+_session.mount("https://", _HTTPAdapter(pool_connections=2, pool_maxsize=4))
 
 _cache_lock = _th.Lock()
 _cache_data = {}
 _cache_source = ""
+_cache_fetched_at = 0.0    # time.monotonic() последнего обновления
+# Одновременно идёт только одно обновление: остальные потоки ждут его и
+# берут готовый результат, а не отправляют свои запросы.
+_refresh_lock = _th.Lock()
+# Потоки для параллельных запросов к источникам погоды
+_executor = _Executor(max_workers=4, thread_name_prefix="weather")
 
 _ICON = {
     0: "☀️", 1: "⛅", 2: "☁️",
@@ -67,11 +88,13 @@ BASE_PATTERNS = [
     "что там с погодой", "какая температура", "прогноз погоды",
 ]
 EXTRA = ["завтра", "послезавтра"] + WEEKDAYS_RU
-PATTERNS = BASE_PATTERNS + \
-    [f"погода {w}" for w in EXTRA] + \
-    [f"какая погода {w}" for w in EXTRA] + \
-    [f"погода в {d}" for d in WEEKDAYS_RU] + \
-    [f"какая погода в {d}" for d in WEEKDAYS_RU]
+PATTERNS = tuple(
+    BASE_PATTERNS
+    + [f"погода {w}" for w in EXTRA]
+    + [f"какая погода {w}" for w in EXTRA]
+    + [f"погода в {d}" for d in WEEKDAYS_RU]
+    + [f"какая погода в {d}" for d in WEEKDAYS_RU]
+)
 
 # ────────────────────────── UTILS ────────────────────────────────
 
@@ -87,6 +110,24 @@ def _plural(n: int, forms: Tuple[str, str, str]) -> str:
     return forms[2]
 
 
+# Дата в запросе: «12.05», «12 05»
+_DATE_RE = _re.compile(r"(\d{1,2})[.\s](\d{1,2})")
+# День недели → смещение от сегодня; пересчитывается только при смене даты
+_weekday_offsets: Tuple[_dt.date | None, Dict[str, int]] = (None, {})
+
+
+def _weekday_map(today: _dt.date) -> Dict[str, int]:
+    global _weekday_offsets
+    day, mapping = _weekday_offsets
+    if day != today:
+        mapping = {
+            WEEKDAYS_RU[(today + _dt.timedelta(days=delta)).weekday()]: delta
+            for delta in range(1, FORECAST_DAYS)
+        }
+        _weekday_offsets = (today, mapping)
+    return mapping
+
+
 def _detect_offset(text: str) -> int:
     """Определяем, о каком дне спрашивает пользователь."""
     t = text.lower()
@@ -95,10 +136,10 @@ def _detect_offset(text: str) -> int:
         return 2
     if "завтра" in t:
         return 1
-    for delta in range(1, FORECAST_DAYS):
-        if WEEKDAYS_RU[(today + _dt.timedelta(days=delta)).weekday()] in t:
+    for weekday, delta in _weekday_map(today).items():
+        if weekday in t:
             return delta
-    m = _re.search(r"(\d{1,2})[.\s](\d{1,2})", t)
+    m = _DATE_RE.search(t)
     if m:
         day, month = map(int, m.groups())
         try:
@@ -112,9 +153,31 @@ def _detect_offset(text: str) -> int:
 
 # ────────────────────────── HTTP WRAPPERS ────────────────────────
 
-def _timed_get(url: str, timeout: int) -> _rq.Response:
-    t0 = _time.perf_counter()
-    resp = _rq.get(url, timeout=timeout)
+def _timed_get(
+    url: str, timeout: Tuple[float, float], cancel: _th.Event | None = None
+) -> _rq.Response:
+    """GET с короткими повторами при сетевых ошибках и таймаутах.
+
+    Пауза между попытками растёт экспоненциально со случайной добавкой,
+    чтобы повторы не шли синхронно. Ошибки HTTP-статуса не повторяются.
+    Если установлен *cancel*, новых попыток больше не делаем.
+    """
+    for attempt in range(RETRY_ATTEMPTS):
+        t0 = _time.perf_counter()
+        try:
+            resp = _session.get(url, timeout=timeout)
+            break
+        except (_rq.ConnectionError, _rq.Timeout) as exc:
+            if attempt == RETRY_ATTEMPTS - 1:
+                raise
+            delay = RETRY_BASE_DELAY * 2 ** attempt
+            delay += _random.uniform(0, RETRY_BASE_DELAY / 2)
+            log.debug("GET %s failed: %s — retry in %.0f ms", url, exc, delay * 1000)
+            if cancel is None:
+                _time.sleep(delay)
+            elif cancel.wait(delay):
+                log.debug("GET %s cancelled, no more retries", url)
+                raise
     dt = (_time.perf_counter() - t0) * 1000
     log.debug("GET %s → %s in %.0f ms", url, resp.status_code, dt)
     resp.raise_for_status()
@@ -122,9 +185,9 @@ def _timed_get(url: str, timeout: int) -> _rq.Response:
 
 # wttr.in --------------------------------------------------------
 
-def _fetch_wttr(lat: str, lon: str):
+def _fetch_wttr(lat: str, lon: str, cancel: _th.Event | None = None):
     url = f"https://wttr.in/{lat},{lon}?format=j1"
-    return _timed_get(url, WTTR_TIMEOUT).json()
+    return _timed_get(url, WTTR_TIMEOUT, cancel).json()
 
 
 def _wttr_desc(obj) -> str:
@@ -152,7 +215,7 @@ def _build_answer_wttr(city: str, data, offset: int) -> str:
 
 # Open‑Meteo ------------------------------------------------------
 
-def _fetch_openmeteo(lat: str, lon: str):
+def _fetch_openmeteo(lat: str, lon: str, cancel: _th.Event | None = None):
     url = (
         "https://api.open-meteo.com/v1/forecast"
         f"?latitude={lat}&longitude={lon}"
@@ -160,7 +223,7 @@ def _fetch_openmeteo(lat: str, lon: str):
         "&daily=weather_code,temperature_2m_max,temperature_2m_min"
         f"&forecast_days={FORECAST_DAYS}&timezone=auto"
     )
-    return _timed_get(url, OPENMETEO_TIMEOUT).json()
+    return _timed_get(url, OPENMETEO_TIMEOUT, cancel).json()
 
 
 def _build_answer_openmeteo(city: str, data, offset: int) -> str:
@@ -183,19 +246,73 @@ def _build_answer_openmeteo(city: str, data, offset: int) -> str:
     return f"{prefix} в {city} {abs(temp)} {degree} {sign}, {cond_ru}.".strip()
 
 
+def _fetch_any() -> Tuple[dict, str]:
+    """Получить погоду из первого ответившего источника.
+
+    Сначала спрашиваем wttr.in. Если за ``HEDGE_DELAY`` он не ответил или
+    упал, параллельно запускаем Open-Meteo и берём первый успешный ответ:
+    медленный wttr.in больше не добавляет свой таймаут к времени ответа.
+
+    Уже выполняющийся запрос прервать нельзя. Поэтому по завершении
+    выставляется ``cancel``: проигравший запрос заканчивает текущую
+    попытку и больше не повторяет её, не занимая потоки пула.
+    """
+    log.debug("Updating weather cache from wttr.in")
+    cancel = _th.Event()
+    futures = {_executor.submit(_fetch_wttr, LAT, LON, cancel): "wttr"}
+    try:
+        done, _ = wait(futures, timeout=HEDGE_DELAY)
+        if not done or next(iter(done)).exception() is not None:
+            log.debug("Wttr is slow or failed — querying OpenMeteo in parallel")
+            futures[_executor.submit(_fetch_openmeteo, LAT, LON, cancel)] = "openmeteo"
+        error: Exception | None = None
+        for fut in as_completed(futures):
+            try:
+                return fut.result(), futures[fut]
+            except Exception as exc:
+                log.warning("%s failed: %s", futures[fut], exc)
+                error = exc
+        raise error
+    finally:
+        cancel.set()
+        for fut in futures:
+            fut.cancel()  # ещё не начатый запрос снимается с очереди
+
+
 def _update_cache() -> None:
-    global _cache_data, _cache_source
+    global _cache_data, _cache_source, _cache_fetched_at
+    requested = _time.monotonic()
+    with _refresh_lock:
+        with _cache_lock:
+            if _cache_data and _cache_fetched_at >= requested:
+                log.debug("Weather cache refreshed by another caller")
+                return
+        data, source = _fetch_any()
+        with _cache_lock:
+            _cache_data = data
+            _cache_source = source
+            _cache_fetched_at = _time.monotonic()
+
+
+def _cached() -> Tuple[dict, str]:
+    """Вернуть данные кэша, обновив их, если кэш пуст или старше TTL."""
+    with _cache_lock:
+        data = _cache_data
+        source = _cache_source
+        age = _time.monotonic() - _cache_fetched_at
+    if data and age <= CACHE_TTL:
+        return data, source
+    log.debug("Weather cache %s, updating synchronously", "stale" if data else "empty")
     try:
-        log.debug("Updating weather cache from wttr.in")
-        data = _fetch_wttr(LAT, LON)
-        source = "wttr"
+        _update_cache()
     except Exception as exc:
-        log.warning("Wttr failed: %s — fallback to OpenMeteo", exc)
-        data = _fetch_openmeteo(LAT, LON)
-        source = "openmeteo"
+        if not data:
+            raise
+        # Сеть недоступна — лучше устаревший прогноз, чем никакого
+        log.warning("Weather refresh failed, using stale cache: %s", exc)
+        return data, source
     with _cache_lock:
-        _cache_data = data
-        _cache_source = source
+        return _cache_data, _cache_source
 
 # ────────────────────────── PUBLIC API ───────────────────────────
 
@@ -218,14 +335,7 @@ def auto_update():
 # ────────────────────────── INTERNALS ────────────────────────────
 
 def _current_for_display() -> Tuple[int, str]:
-    with _cache_lock:
-        data = _cache_data
-        source = _cache_source
-    if not data:
-        _update_cache()
-        with _cache_lock:
-            data = _cache_data
-            source = _cache_source
+    data, source = _cached()
     try:
         if source == "wttr":
             cur = data["current_condition"][0]
@@ -243,15 +353,7 @@ def _current_for_display() -> Tuple[int, str]:
 
 
 def _build_answer(offset: int = 0) -> str:
-    with _cache_lock:
-        data = _cache_data
-        source = _cache_source
-    if not data:
-        log.debug("Weather cache empty, updating synchronously")
-        _update_cache()
-        with _cache_lock:
-            data = _cache_data
-            source = _cache_source
+    data, source = _cached()
     if source == "wttr":
         log.debug("Using wttr.in cached data")
         return _build_answer_wttr(CITY, data, offset)
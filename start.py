@@ -8,17 +8,18 @@ from __future__ import annotations
 ``jarvis_skills``, ``emotion`` и др.
 """
 
-import array
 import asyncio
 import configparser
 import json
+import queue
 import signal
+import struct
 import sys
 import threading
-from collections import deque
-from typing import Any
+from typing import Any, Callable
 
 from display import DisplayItem, init_driver, DisplayDriver
+from utils.pcm_ring import PcmRing
 from core.logging_json import TRACE_ID, configure_logging, new_trace_id
 from core import stop as stop_mgr
 from emotion import sounds
@@ -51,6 +52,68 @@ signal.signal(signal.SIGTERM, _shutdown)
 
 # ────────────────────────── MAIN LOOP ────────────────────────────
 
+# Сколько секунд аудио может ждать распознавания. Запас больше буфера
+# повторного распознавания (1.5 с): пока поток ASR «проигрывает» буфер
+# после слова активации или завершает фразу, начало команды не теряется.
+MIC_QUEUE_SEC = 3.0
+
+# Сколько кадров отброшено из-за переполнения очереди микрофона
+_dropped_frames = 0
+
+
+def _enqueue_frame(frames: queue.Queue, frame: Any) -> None:
+    """Положить кадр в очередь, вытеснив самый старый при переполнении."""
+    global _dropped_frames
+    while True:
+        try:
+            frames.put_nowait(frame)
+            return
+        except queue.Full:
+            try:
+                frames.get_nowait()
+            except queue.Empty:
+                continue
+            _dropped_frames += 1
+            log.warning(
+                "Очередь микрофона переполнена, старый кадр отброшен (всего: %d)",
+                _dropped_frames,
+            )
+
+
+def _mic_reader(recorder: Any, frames: queue.Queue) -> None:
+    """Читать кадры микрофона в отдельном потоке.
+
+    Поток только читает ``recorder`` и складывает кадры в *frames*, поэтому
+    всплеск нагрузки в распознавателе не задерживает чтение микрофона.
+    При ошибке чтения в очередь кладётся ``None``, чтобы потребитель не
+    ждал вечно.
+    """
+    try:
+        while True:
+            _enqueue_frame(frames, recorder.read())
+    except Exception:  # pragma: no cover - зависит от железа
+        log.exception("Ошибка чтения микрофона")
+        _enqueue_frame(frames, None)
+
+
+def _run_asr(
+    recognize: Callable[[], None],
+    loop: asyncio.AbstractEventLoop,
+    commands: asyncio.Queue,
+) -> None:
+    """Выполнить цикл распознавания *recognize* в потоке ASR.
+
+    Любое исключение логируется, а по завершении потока в *commands*
+    кладётся ``None``: иначе основной цикл ждал бы команд вечно, а ошибка
+    осталась бы только в stderr.
+    """
+    try:
+        recognize()
+    except Exception:
+        log.exception("Ошибка в потоке распознавания речи")
+    finally:
+        loop.call_soon_threadsafe(commands.put_nowait, None)
+
 
 def init_display_from_config(cfg: configparser.ConfigParser) -> DisplayDriver:
     """Инициализировать драйвер дисплея на основе ``config.ini``.
@@ -72,6 +135,13 @@ def init_display_from_config(cfg: configparser.ConfigParser) -> DisplayDriver:
 
     return driver
 
+def _load_vosk_model() -> tuple[Any, Any]:
+    """Импортировать ``vosk`` и загрузить модель распознавания."""
+    import vosk
+
+    return vosk, vosk.Model("models/model_small")
+
+
 async def main() -> None:
     """Инициализация и основной цикл ассистента."""
 
@@ -94,6 +164,13 @@ async def main() -> None:
 
     driver.draw(DisplayItem(kind="mode", payload="boot"))
 
+    # Импорт vosk и загрузка модели занимают секунды. Запускаем их в
+    # отдельном потоке сразу, параллельно с инициализацией остальных
+    # подсистем, и дожидаемся результата только перед распознаванием.
+    # ``run_in_executor`` отдаёт работу пулу сразу, не дожидаясь, пока
+    # корутина уступит управление циклу событий.
+    model_future = asyncio.get_running_loop().run_in_executor(None, _load_vosk_model)
+
     from emotion.manager import EmotionManager
     from emotion.drivers import EmotionDisplayDriver
     from emotion.sounds import EmotionSoundDriver
@@ -109,16 +186,15 @@ async def main() -> None:
     from core.nlp import normalize
     from app import command_processing
     from app.command_processing import (
+        contains_activation,
         contains_stop,
         extract_cmd,
         is_stop_cmd,
         va_respond,
-        _matches_activation,
     )
     from app.presence_session import setup_presence_session
     from app.gui import gui_loop
     from app.scheduler import start_background_tasks
-    import vosk
     import yaml
     from pvrecorder import PvRecorder
 
@@ -126,9 +202,10 @@ async def main() -> None:
     EmotionSoundDriver()           # звуки при смене эмоций
 
     # 1. Конфигурация и загрузка скиллов
-    command_processing.VA_CMD_LIST = yaml.safe_load(
-        open("commands.yaml", "rt", encoding="utf-8")
-    )
+    # C-загрузчик libyaml, если PyYAML собран с ним; иначе чистый Python
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open("commands.yaml", "rt", encoding="utf-8") as f:
+        command_processing.VA_CMD_LIST = yaml.load(f, Loader=loader)
     command_processing.VA_CMD_LIST = {
         k: [normalize(v) for v in variants]
         for k, variants in command_processing.VA_CMD_LIST.items()
@@ -213,27 +290,32 @@ async def main() -> None:
         )
 
     # 2. Распознавание речи (Vosk)
-    model = vosk.Model('models/model_small')
+    vosk, model = await model_future
     kaldi = vosk.KaldiRecognizer(model, 16000)
     recorder = PvRecorder(device_index=mic_idx, frame_length=512)
+    # PvRecorder отдаёт кадр списком int16. Заранее скомпилированный формат
+    # упаковывает его в bytes за один вызов, без промежуточного array.array.
+    pcm_struct = struct.Struct(f"{recorder.frame_length}h")
 
-    # Кольцевой буфер на ~1.5 секунды аудио.
-    # Храним последние PCM-кадры, чтобы при позднем обнаружении слова
+    # Кольцевой буфер на ~1.5 секунды аудио (один bytearray).
+    # Храним последние PCM-данные, чтобы при позднем обнаружении слова
     # активации повторно передать их в распознаватель и не потерять
     # начало команды.  Запас в 1.5 с позволяет уверенно захватывать
     # длинное слово «джарвис» даже на шумном микрофоне.
     buffer_size = int(1.5 * 16000 / recorder.frame_length)
-    pcm_buffer: deque[bytes] = deque(maxlen=buffer_size)
-    # Флаг, что слово активации уже было найдено и буфер «прокручен».
-    # Позволяет избежать многократных повторных распознаваний, когда
-    # ``PartialResult`` продолжает содержать «джарвис» несколько итераций подряд.
-    activated = False
+    pcm_buffer = PcmRing(buffer_size * recorder.frame_length * 2)
 
     # 3. Приветственный звук (синхронно, чтобы не потерялся)
     await asyncio.to_thread(sounds.play_effect, "WAKE")
     driver.draw(DisplayItem(kind="mode", payload="run"))
 
     recorder.start()
+    frames: queue.Queue = queue.Queue(
+        maxsize=int(MIC_QUEUE_SEC * 16000 / recorder.frame_length)
+    )
+    threading.Thread(
+        target=_mic_reader, args=(recorder, frames), name="MicReader", daemon=True
+    ).start()
     asyncio.create_task(gui_loop())
 
     log.info("Говорите команды, начиная с 'джарвис'")
@@ -261,77 +343,127 @@ async def main() -> None:
         finally:
             publish(Event(kind="user_query_ended", attrs={"text": text, "trace_id": trace_id}))
 
-    while True:
-        # Читаем с микрофона в отдельном потоке, чтобы не блокировать event loop
-        raw_data = await asyncio.to_thread(recorder.read)
-        pcm_arr = array.array('h', raw_data)
-        pcm = pcm_arr.tobytes()
-        if kaldi.AcceptWaveform(pcm):
-            # Фраза завершена: собираем финальный текст.
-            result = json.loads(kaldi.Result()).get('text', '')
-            if not result:
-                kaldi.Reset()
+    # Распознавание идёт в отдельном потоке: ``AcceptWaveform`` тратит
+    # миллисекунды CPU на кадр (больше при завершении фразы) и отпускает
+    # GIL, а цикл событий остаётся свободным для дисплея, Telegram и
+    # команд. В цикл событий передаются только готовые фразы с активацией.
+    loop = asyncio.get_running_loop()
+    commands: asyncio.Queue = asyncio.Queue()
+
+    def _asr_worker() -> None:
+        # Флаг, что слово активации уже было найдено и буфер «прокручен».
+        # Позволяет избежать многократных повторных распознаваний, когда
+        # ``PartialResult`` продолжает содержать «джарвис» несколько итераций подряд.
+        activated = False
+        # Последний сырой PartialResult: Vosk много кадров подряд повторяет
+        # один и тот же промежуточный текст, разбирать его заново незачем.
+        # После каждого ``kaldi.Reset()`` значение сбрасывается.
+        prev_partial = ""
+        while True:
+            raw_data = frames.get()
+            if raw_data is None:
+                return  # микрофон остановлен, _run_asr сообщит циклу событий
+            pcm = pcm_struct.pack(*raw_data)
+            if kaldi.AcceptWaveform(pcm):
+                prev_partial = ""
+                # Фраза завершена: собираем финальный текст.
+                result = json.loads(kaldi.Result()).get('text', '')
+                if not result:
+                    kaldi.Reset()
+                    pcm_buffer.clear()
+                    activated = False
+                    continue
+                if activated and not result.startswith("джарвис"):
+                    # Иногда Vosk отбрасывает первое слово — возвращаем его вручную.
+                    log.debug("Слово активации отсутствует в финальном тексте — добавляю")
+                    result = f"джарвис {result}".strip()
+                log.info("Услышано: %s", result)  # логируем каждую распознанную фразу
+                if working_tts.is_playing:
+                    # Во время озвучивания реагируем на «джарвис стоп» и просто «стоп»
+                    if is_stop_cmd(result) or contains_stop(result):
+                        working_tts.stop_speaking()
+                        stop_mgr.trigger()
+                    kaldi.Reset()
+                    pcm_buffer.clear()
+                    activated = False
+                    continue
+                cmd = extract_cmd(result)  # есть слово активации с небольшой погрешностью
+                if cmd:
+                    loop.call_soon_threadsafe(commands.put_nowait, result)
                 pcm_buffer.clear()
-                activated = False
-                continue
-            if activated and not result.startswith("джарвис"):
-                # Иногда Vosk отбрасывает первое слово — возвращаем его вручную.
-                log.debug("Слово активации отсутствует в финальном тексте — добавляю")
-                result = f"джарвис {result}".strip()
-            log.info("Услышано: %s", result)  # логируем каждую распознанную фразу
-            if working_tts.is_playing:
-                # Во время озвучивания реагируем на «джарвис стоп» и просто «стоп»
-                if is_stop_cmd(result) or contains_stop(result):
-                    working_tts.stop_speaking()
-                    stop_mgr.trigger()
                 kaldi.Reset()
-                pcm_buffer.clear()
                 activated = False
-                continue
-            cmd = extract_cmd(result)  # есть слово активации с небольшой погрешностью
-            if cmd:
-                publish(Event(kind="speech.recognized", attrs={"text": result}))
-                asyncio.create_task(process_command(result))
-            pcm_buffer.clear()
-            kaldi.Reset()
-            activated = False
-        else:
-            part = json.loads(kaldi.PartialResult()).get('partial', '')
-            if part:
-                log.debug("Промежуточно услышано: %s", part)
-                # Проверяем, не произносится ли команда «стоп»
-                if working_tts.is_playing and (
-                    is_stop_cmd(part) or contains_stop(part)
-                ):
-                    working_tts.stop_speaking()
-                    stop_mgr.trigger()
-                    kaldi.Reset()
-                    pcm_buffer.clear()
+            else:
+                raw_partial = kaldi.PartialResult()
+                if raw_partial == prev_partial:
+                    part = ""  # текст не изменился — уже проверен
                 else:
-                    # Проверяем, не появилось ли слово активации в промежуточном тексте
-                    if (not activated) and any(
-                        _matches_activation(w) for w in part.split()
+                    prev_partial = raw_partial
+                    part = json.loads(raw_partial).get('partial', '')
+                if part:
+                    log.debug("Промежуточно услышано: %s", part)
+                    # Проверяем, не произносится ли команда «стоп»
+                    if working_tts.is_playing and (
+                        is_stop_cmd(part) or contains_stop(part)
                     ):
-                        log.info("Обнаружено слово активации в потоке: %s", part)
-                        log.debug(
-                            "Размер буфера перед повторным распознаванием: %d",
-                            len(pcm_buffer),
-                        )
-                        # Сбрасываем распознаватель и повторно «проигрываем»
-                        # накопленные кадры, чтобы не потерять начало слова
+                        working_tts.stop_speaking()
+                        stop_mgr.trigger()
                         kaldi.Reset()
-                        for old_pcm in pcm_buffer:
-                            _ = kaldi.AcceptWaveform(old_pcm)
-                        _ = kaldi.AcceptWaveform(pcm)
-                        log.info("Повторное распознавание выполнено")
+                        prev_partial = ""
                         pcm_buffer.clear()
-                        activated = True
+                    else:
+                        # Проверяем, не появилось ли слово активации в промежуточном тексте
+                        if (not activated) and contains_activation(part):
+                            log.info("Обнаружено слово активации в потоке: %s", part)
+                            log.debug(
+                                "Размер буфера перед повторным распознаванием: %d байт",
+                                len(pcm_buffer),
+                            )
+                            # Сбрасываем распознаватель и повторно «проигрываем»
+                            # накопленное аудио, чтобы не потерять начало слова
+                            kaldi.Reset()
+                            for old_pcm in pcm_buffer.chunks():
+                                _ = kaldi.AcceptWaveform(old_pcm)
+                            _ = kaldi.AcceptWaveform(pcm)
+                            log.info("Повторное распознавание выполнено")
+                            prev_partial = ""
+                            pcm_buffer.clear()
+                            activated = True
+
+            # Добавляем текущий кадр в кольцевой буфер и выводим его размер
+            pcm_buffer.append(pcm)
+            log.debug("Размер кольцевого буфера: %d байт", len(pcm_buffer))
+
+    threading.Thread(
+        target=_run_asr, args=(_asr_worker, loop, commands), name="ASR", daemon=True
+    ).start()
+
+    while True:
+        result = await commands.get()
+        if result is None:
+            raise RuntimeError("speech recognition stopped")
+        publish(Event(kind="speech.recognized", attrs={"text": result}))
+        asyncio.create_task(process_command(result))
+
+
+def _install_uvloop() -> None:
+    """Включить ``uvloop``, если он установлен.
+
+    Цикл событий на libuv быстрее переключает задачи и обрабатывает
+    ввод-вывод, чем стандартный selector-цикл. Пакет необязателен: без
+    него используется обычный ``asyncio``.
+    """
+    try:
+        import uvloop  # type: ignore
+    except ImportError:
+        log.debug("uvloop не установлен, используется стандартный цикл asyncio")
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    log.info("Цикл событий: uvloop")
 
-        # Добавляем текущий кадр в кольцевой буфер и выводим его размер
-        pcm_buffer.append(pcm)
-        log.debug("Размер кольцевого буфера: %d", len(pcm_buffer))
 
 if __name__ == "__main__":
+    _install_uvloop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+# Гарантируем, что корень репозитория в sys.path, иначе пакет `memory`
+# может не обнаружиться при запуске теста из подпапки.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from memory import db as memory_db
+
+
+def test_migrations_run_once_per_file(tmp_path, monkeypatch):
+    """Миграции выполняются при первом подключении и для нового файла."""
+
+    calls = []
+    real_migrate = memory_db._migrate
+
+    def counting_migrate(conn):
+        calls.append(1)
+        real_migrate(conn)
+
+    monkeypatch.setattr(memory_db, "_migrate", counting_migrate)
+    monkeypatch.setattr(memory_db, "_MIGRATED", set())
+    db_file = tmp_path / "memory.sqlite3"
+    monkeypatch.setattr(memory_db, "DB_PATH", db_file)
+
+    memory_db.get_connection().close()
+    conn = memory_db.get_connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+    assert len(calls) == 1
+
+    # Файл удалён — схема создаётся заново
+    for path in tmp_path.iterdir():
+        path.unlink()
+    conn = memory_db.get_connection()
+    conn.execute("SELECT 1 FROM timers").fetchall()
+    conn.close()
+    assert len(calls) == 2
+
+
+def test_wal_enabled_once_per_file(tmp_path, monkeypatch):
+    """Режим WAL задаётся при первом открытии, дальше остаётся в файле."""
+
+    calls = []
+    real_enable = memory_db._enable_wal
+
+    def counting_enable(conn):
+        calls.append(1)
+        real_enable(conn)
+
+    monkeypatch.setattr(memory_db, "_enable_wal", counting_enable)
+    monkeypatch.setattr(memory_db, "_MIGRATED", set())
+    monkeypatch.setattr(memory_db, "DB_PATH", tmp_path / "memory.sqlite3")
+
+    for _ in range(3):
+        conn = memory_db.get_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        conn.close()
+    assert len(calls) == 1
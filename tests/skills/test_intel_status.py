@@ -48,3 +48,26 @@ def test_handle_saves_note(recorders):
     assert reply == "Запомнил"
     assert pref.calls == []
     assert note.calls == [(("купить молоко", [intel_status.LABEL]), {})]
+
+
+def test_report_reads_presence_and_context(monkeypatch, tmp_path):
+    """Отчёт собирает последнюю сессию присутствия и записи контекста."""
+
+    from memory import db
+
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "memory.sqlite3")
+    monkeypatch.setattr(intel_status, "get_events_by_label", lambda label: [])
+    conn = db.get_connection()
+    conn.execute(
+        "INSERT INTO presence_sessions (start_ts, end_ts) VALUES (?, NULL)", (0,)
+    )
+    conn.execute(
+        "INSERT INTO context_items (key, value, ts) VALUES (?, ?, ?)",
+        ("note:1", '{"text": "купить молоко"}', 1),
+    )
+    conn.commit()
+    conn.close()
+
+    reply = intel_status.handle("что ты запомнил")
+    assert "ещё идёт" in reply
+    assert "купить молоко" in reply
@@ -93,15 +93,16 @@ def test_think_saves_dialog(monkeypatch):
         # сохраняем переданные данные для последующей проверки
         fake_post.last_payload = json
         fake_post.last_headers = headers or {}
-        return DummyResponse({"choices": [{"message": {"content": "привет"}}]})
+        return DummyResponse({"message": {"role": "assistant", "content": "привет"}})
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(llm_engine._session, "post", fake_post)
     monkeypatch.setattr(long_term, "add_daily_event", lambda text, labels: saved.append((text, labels)))
 
     reply = llm_engine.think("Как дела?", trace_id="42")
     assert reply == "привет"
     assert fake_post.last_headers["X-Trace-Id"] == "42"
     assert fake_post.last_payload["stream"] is False
+    assert fake_post.last_payload["keep_alive"] == llm_engine.KEEP_ALIVE
     assert "Как дела?" in fake_post.last_payload["messages"][0]["content"]
     assert short_term.get_last()[-1] == {
         "trace_id": "42",
@@ -129,3 +129,17 @@ def test_suggestion_answer_bypasses_handlers(monkeypatch):
     assert feedback == [(1, "ок", True)]
     assert events and events[0].attrs["suggestion_id"] == 1
 
+
+
+def test_contains_activation_and_stop(monkeypatch):
+    """Точные слова находятся regex, искажённые — нечётким сравнением."""
+
+    cp = _load_cp(monkeypatch)
+    assert cp.contains_activation("ну джарвис включи свет")
+    assert cp.contains_activation("джервис включи свет")
+    assert not cp.contains_activation("включи свет")
+
+    assert cp.contains_stop("джарвис стой")
+    assert cp.contains_stop("ну Стоп")
+    assert cp.contains_stop("стап")
+    assert not cp.contains_stop("расстояние до луны")
@@ -68,3 +68,31 @@ def test_invalid_rotation(tmp_path):
         pass
     else:  # pragma: no cover - требуется исключение
         raise AssertionError("ConfigError not raised")
+
+
+def test_show_window_env_override(tmp_path, monkeypatch):
+    """PRESENCE_SHOW_WINDOW из окружения перекрывает значение из INI."""
+    cfg = tmp_path / "cfg.ini"
+    cfg.write_text(
+        textwrap.dedent(
+            """
+            [USER]
+            name = u
+            telegram_user_id = 0
+            [INTEL]
+            api_key = key
+            absent_after_sec = 5
+            [TELEGRAM]
+            token = t
+            [PRESENCE]
+            enabled = true
+            camera_index = 0
+            frame_interval_ms = 200
+            show_window = true
+            frame_rotation = 0
+            """
+        )
+    )
+    monkeypatch.setenv("PRESENCE_SHOW_WINDOW", "off")
+    app_cfg = load_config(str(cfg))
+    assert app_cfg.presence.show_window is False
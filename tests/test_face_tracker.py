@@ -21,6 +21,7 @@ def _setup_driver(monkeypatch):
     ft._driver = None
     ft._last_sent_ms = None
     ft._tracking_active = False
+    ft._last_track_dx = ft._last_track_dy = None
     return driver
 
 
@@ -59,3 +60,40 @@ def test_track_commands(monkeypatch):
     tracker.update(None)
     # вторая команда - остановка
     assert driver.items[-1].payload is None
+
+
+def test_track_dt_uses_frame_timestamps(monkeypatch):
+    """Интервал dt_ms считается по моментам кадров, а не по часам вызова."""
+    driver = _setup_driver(monkeypatch)
+    tracker = FaceTracker(alpha=1.0)
+
+    tracker.update((0.75, 0.5), 100, 100, now=10.0)
+    tracker.update((0.25, 0.5), 100, 100, now=10.125)
+    assert driver.items[-1].payload["dt_ms"] == 125
+
+
+def test_sent_track_packets_are_not_mutated(monkeypatch):
+    """Отправленный пакет не меняется последующими отправками."""
+    driver = _setup_driver(monkeypatch)
+    for i in range(10):
+        ft._send_track(float(i), 0.0, 10)
+
+    assert len({id(item.payload) for item in driver.items}) == 10
+    assert [item.payload["dx_px"] for item in driver.items] == [float(i) for i in range(10)]
+
+
+def test_track_deadband(monkeypatch):
+    """Почти неизменное смещение не отправляется, пока не истёк таймаут."""
+    driver = _setup_driver(monkeypatch)
+
+    assert ft._send_track(10.0, 5.0, 0) is True
+    assert ft._send_track(10.2, 5.1, 30) is False
+    assert ft._send_track(11.0, 5.1, 30) is True
+    assert ft._send_track(11.0, 5.1, ft.TRACK_MAX_SILENCE_MS) is True
+    assert len(driver.items) == 3
+    # пропущенные вызовы не трогают уже отправленные пакеты
+    assert [item.payload for item in driver.items] == [
+        {"dx_px": 10.0, "dy_px": 5.0, "dt_ms": 0},
+        {"dx_px": 11.0, "dy_px": 5.1, "dt_ms": 30},
+        {"dx_px": 11.0, "dy_px": 5.1, "dt_ms": ft.TRACK_MAX_SILENCE_MS},
+    ]
@@ -24,3 +24,10 @@ def test_activity_by_hour_skill(monkeypatch):
     monkeypatch.setattr(activity_by_hour, "load_last_aggregate", lambda: data)
     res = activity_by_hour.handle("какая у меня активность по часам")
     assert "05:00" in res and "20 мин" in res
+
+
+def test_activity_by_hour_skill_ignores_seconds(monkeypatch):
+    data = [0] * 24
+    data[7] = 30  # меньше минуты — в ответ не попадает
+    monkeypatch.setattr(activity_by_hour, "load_last_aggregate", lambda: data)
+    assert activity_by_hour.handle("активность по часам") == "Нет данных об активности"
@@ -0,0 +1,57 @@
+import datetime as dt
+
+from skills import holiday_ru
+
+
+class _Resp:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+def test_holidays_are_fetched_once_per_year(monkeypatch):
+    """Повторный вопрос о праздниках не делает новый HTTP-запрос."""
+
+    holiday_ru._get_holidays.cache_clear()
+    today = dt.date.today()
+    calls = []
+
+    def fake_get(url, timeout):
+        calls.append(url)
+        return _Resp([{"date": today.isoformat(), "localName": "Тестовый день"}])
+
+    monkeypatch.setattr(holiday_ru.requests, "get", fake_get)
+    try:
+        first = holiday_ru.handle("какой сегодня праздник")
+        second = holiday_ru.handle("какие праздники сегодня")
+    finally:
+        holiday_ru._get_holidays.cache_clear()
+
+    assert "Тестовый день" in first
+    assert second == first
+    assert len(calls) == 1
+
+
+def test_failed_request_is_not_cached(monkeypatch):
+    """Ошибка сети не запоминается — следующий вызов повторяет запрос."""
+
+    holiday_ru._get_holidays.cache_clear()
+    calls = []
+
+    def fake_get(url, timeout):
+        calls.append(url)
+        raise OSError("network down")
+
+    monkeypatch.setattr(holiday_ru.requests, "get", fake_get)
+    try:
+        assert "Не удалось" in holiday_ru.handle("какой сегодня праздник")
+        assert "Не удалось" in holiday_ru.handle("какой сегодня праздник")
+    finally:
+        holiday_ru._get_holidays.cache_clear()
+
+    assert len(calls) == 2
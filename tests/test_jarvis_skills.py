@@ -31,7 +31,11 @@ def test_handle_utterance_uses_voice_notifier_for_telegram(monkeypatch):
     def fake_skill(text: str) -> str:
         return "ответ"
 
-    monkeypatch.setattr(jarvis_skills, "_loaded", [(["тест"], fake_skill)])
+    monkeypatch.setattr(
+        jarvis_skills,
+        "_loaded",
+        [(["тест"], jarvis_skills._literal_re(["тест"]), fake_skill)],
+    )
 
     token = set_request_source("telegram")
     try:
@@ -63,7 +67,11 @@ def test_handle_utterance_from_thread(monkeypatch):
     def fake_skill(text: str) -> str:
         return "ответ"
 
-    monkeypatch.setattr(jarvis_skills, "_loaded", [(["тест"], fake_skill)])
+    monkeypatch.setattr(
+        jarvis_skills,
+        "_loaded",
+        [(["тест"], jarvis_skills._literal_re(["тест"]), fake_skill)],
+    )
 
     token = set_request_source("telegram")
 
@@ -101,7 +109,40 @@ def test_handle_utterance_passes_trace_id(monkeypatch):
         traces.append(trace_id)
         return "ok"
 
-    monkeypatch.setattr(jarvis_skills, "_loaded", [(["тест"], fake_skill)])
+    monkeypatch.setattr(
+        jarvis_skills,
+        "_loaded",
+        [(["тест"], jarvis_skills._literal_re(["тест"]), fake_skill)],
+    )
 
     assert jarvis_skills.handle_utterance("тест") is True
     assert traces and len(traces[0]) == 32  # uuid.uuid4().hex имеет длину 32 символа
+
+
+def test_literal_pattern_skips_fuzzy_scoring(monkeypatch):
+    """Дословное вхождение шаблона выбирает скилл без вызова rapidfuzz."""
+
+    import types, sys
+
+    fake_nlp = types.SimpleNamespace(normalize=lambda s: s)
+    monkeypatch.setitem(sys.modules, "core.nlp", fake_nlp)
+
+    import jarvis_skills
+
+    sent: list[str] = []
+    fake_voice = types.SimpleNamespace(send=lambda text, **kw: sent.append(text))
+    monkeypatch.setitem(sys.modules, "notifiers.voice", fake_voice)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("fuzzy scoring should be skipped")
+
+    monkeypatch.setattr(jarvis_skills.fuzz, "ratio", fail)
+    monkeypatch.setattr(jarvis_skills.fuzz, "token_set_ratio", fail)
+    monkeypatch.setattr(
+        jarvis_skills,
+        "_loaded",
+        [(["как дела"], jarvis_skills._literal_re(["как дела"]), lambda text: "хорошо")],
+    )
+
+    assert jarvis_skills.handle_utterance("ну как дела") is True
+    assert sent == ["хорошо"]
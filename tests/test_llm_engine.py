@@ -144,9 +144,9 @@ def test_query_falls_back_to_generate(monkeypatch):
     def fake_post(url, json, headers=None, timeout=60):
         # фиксируем URL вызова и игнорируем переданные заголовки
         calls.append(url)
-        return Resp404() if url.endswith("/v1/chat/completions") else RespOK()
+        return Resp404() if url.endswith("/api/chat") else RespOK()
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(llm_engine._session, "post", fake_post)
     monkeypatch.setattr(long_term, "get_events_by_label", lambda label: [])
     monkeypatch.setattr(long_term, "add_daily_event", lambda text, labels: None)
     monkeypatch.setattr(
@@ -156,7 +156,7 @@ def test_query_falls_back_to_generate(monkeypatch):
     result = llm_engine.think("тема", trace_id="123")
     assert result == "привет"
     assert calls == [
-        f"{llm_engine.BASE_URL}/v1/chat/completions",
+        f"{llm_engine.BASE_URL}/api/chat",
         f"{llm_engine.BASE_URL}/api/generate",
     ]
 
@@ -184,7 +184,7 @@ def test_query_reports_model_not_found(monkeypatch):
         calls.append(url)
         return Resp404()
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(llm_engine._session, "post", fake_post)
     monkeypatch.setattr(
         llm_engine.long_memory, "retrieve_similar", lambda query, top_k=5: []
     )
@@ -194,7 +194,7 @@ def test_query_reports_model_not_found(monkeypatch):
 
     assert "модель" in str(exc.value).lower()
     # Убедимся, что повторного вызова на /api/generate не было
-    assert calls == [f"{llm_engine.BASE_URL}/v1/chat/completions"]
+    assert calls == [f"{llm_engine.BASE_URL}/api/chat"]
 
 
 def test_reflect_parses_json(monkeypatch):
@@ -32,7 +32,10 @@ def test_run_auto_grants_consent(monkeypatch):
         def isOpened(self):
             return True
 
-        def read(self):
+        def set(self, _prop, _value):
+            return True
+
+        def grab(self):
             # Прерываем цикл сразу после первого обращения к камере
             raise KeyboardInterrupt
 
@@ -44,6 +47,14 @@ def test_run_auto_grants_consent(monkeypatch):
         ROTATE_180 = 1
         ROTATE_90_COUNTERCLOCKWISE = 2
         COLOR_BGR2RGB = 0
+        CAP_PROP_FOURCC = 6
+        CAP_PROP_FRAME_WIDTH = 3
+        CAP_PROP_FRAME_HEIGHT = 4
+        CAP_PROP_BUFFERSIZE = 38
+        CAP_PROP_FPS = 5
+
+        def VideoWriter_fourcc(self, *_chars):
+            return 0
 
         def VideoCapture(self, index):
             return _Cap()
@@ -88,3 +99,212 @@ def test_run_auto_grants_consent(monkeypatch):
     # Убедимся, что согласие было выдано автоматически и попытка включения камеры повторилась
     assert calls["grant"] == 1
     assert calls["active"] >= 2
+
+
+def test_display_thread_keeps_latest_frame():
+    """Поток окна хранит только последний кадр и не блокирует производителя."""
+    from sensors.vision.presence import _DisplayThread
+
+    viewer = _DisplayThread("test")
+    viewer.show("frame1")
+    viewer.show("frame2")
+    assert viewer._frames.get_nowait() == "frame2"
+    assert viewer._frames.empty()
+    viewer.close()
+    assert viewer.stop_event.is_set()
+
+
+def test_run_releases_camera_when_consent_denied(monkeypatch):
+    """Если камеру включить не удалось, устройство освобождается."""
+
+    class _Cap:
+        released = False
+
+        def isOpened(self):
+            return True
+
+        def set(self, _prop, _value):
+            return True
+
+        def release(self):
+            self.released = True
+
+    cap = _Cap()
+    cv2_stub = type(
+        "CV2",
+        (),
+        {
+            "CAP_PROP_FOURCC": 6,
+            "CAP_PROP_FRAME_WIDTH": 3,
+            "CAP_PROP_FRAME_HEIGHT": 4,
+            "CAP_PROP_BUFFERSIZE": 38,
+            "CAP_PROP_FPS": 5,
+            "VideoWriter_fourcc": staticmethod(lambda *_chars: 0),
+            "VideoCapture": staticmethod(lambda _index: cap),
+        },
+    )
+    monkeypatch.setattr("sensors.vision.presence.cv2", cv2_stub)
+    monkeypatch.setattr("sensors.vision.presence.mp", object())
+
+    def _deny(_sensor, _active):
+        raise PermissionError
+
+    monkeypatch.setattr("sensors.vision.presence.set_active", _deny)
+    monkeypatch.setattr("sensors.vision.presence.grant_consent", lambda _s: None)
+
+    det = PresenceDetector(camera_index=0, frame_interval_ms=100, absent_after_sec=5, frame_rotation=0)
+    det.run()
+
+    assert cap.released
+    assert det._cap is None
+
+
+def test_capture_thread_skips_duplicates_and_propagates_errors():
+    """Поток захвата не отдаёт кадр дважды и пробрасывает ошибку камеры."""
+    from sensors.vision.presence import _CaptureThread
+
+    class _Cap:
+        def __init__(self):
+            self.grabs = 0
+            self.retrieves = 0
+
+        def grab(self):
+            self.grabs += 1
+            if self.grabs > 3:
+                raise RuntimeError("camera gone")
+            return True
+
+        def retrieve(self):
+            self.retrieves += 1
+            return True, f"frame{self.grabs}"
+
+    cap = _Cap()
+    capture = _CaptureThread(cap)
+    capture.start()
+    capture._thread.join(timeout=1.0)
+
+    with pytest.raises(RuntimeError):
+        capture.latest()
+    capture._error = None
+
+    # Декодируется только первый кадр: остальные никто не запрашивал
+    frame_id, _ts, frame = capture.latest()
+    assert (frame_id, frame) == (1, "frame1")
+    assert cap.retrieves == 1
+    assert capture.latest(frame_id) is None
+    assert capture._wanted.is_set()
+    capture.close()
+
+
+def test_capture_latest_waits_for_next_frame():
+    """``latest`` с таймаутом ждёт новый кадр, а не возвращается сразу."""
+    import threading
+    from sensors.vision.presence import _CaptureThread
+
+    release = threading.Event()
+
+    class _Cap:
+        def grab(self):
+            release.wait()
+            return True
+
+        def retrieve(self):
+            return True, "frame"
+
+    capture = _CaptureThread(_Cap())
+    capture.start()
+    assert capture.latest(timeout=0.05) is None
+    threading.Timer(0.05, release.set).start()
+    frame_id, _ts, frame = capture.latest(timeout=2.0)
+    assert (frame_id, frame) == (1, "frame")
+    capture.close()
+
+
+
+def test_capture_release_waits_for_blocked_grab():
+    """Камера не освобождается, пока поток захвата висит в ``grab``."""
+    import threading
+    from sensors.vision.presence import _CaptureThread
+
+    in_grab = threading.Event()
+    unblock = threading.Event()
+    released = threading.Event()
+
+    class _Cap:
+        def grab(self):
+            in_grab.set()
+            unblock.wait()
+            return False
+
+        def retrieve(self):  # pragma: no cover - не вызывается
+            return False, None
+
+        def release(self):
+            assert not in_grab.is_set() or unblock.is_set()
+            released.set()
+
+    capture = _CaptureThread(_Cap(), retry_sec=0.0)
+    capture.start()
+    assert in_grab.wait(1.0)
+    capture.stop_event.set()
+    capture.release_device()
+    assert not released.is_set()
+    unblock.set()
+    assert released.wait(1.0)
+    capture.close()
+    assert not capture.is_alive()
+
+
+def test_capture_release_without_thread():
+    """Если поток не запускался, камера освобождается сразу."""
+    from sensors.vision.presence import _CaptureThread
+
+    calls = []
+
+    class _Cap:
+        def release(self):
+            calls.append(1)
+
+    _CaptureThread(_Cap()).release_device()
+    assert calls == [1]
+
+def test_downscale_keeps_aspect_and_small_frames(monkeypatch):
+    """Кадр уменьшается по длинной стороне, маленький кадр не трогается."""
+    from sensors.vision import presence
+
+    calls = []
+
+    class _CV2:
+        INTER_AREA = 3
+
+        @staticmethod
+        def resize(frame, size, dst=None, interpolation=None):
+            calls.append((size, dst, interpolation))
+            return "small"
+
+    monkeypatch.setattr(presence, "cv2", _CV2)
+    frame = type("F", (), {"shape": (480, 640, 3)})()
+
+    assert presence._downscale(frame, 320) == "small"
+    assert presence._downscale(frame, 320, "buf") == "small"
+    assert calls == [((320, 240), None, 3), ((320, 240), "buf", 3)]
+    assert presence._downscale(frame, 640) is frame
+
+
+def test_absence_uses_frame_timestamp():
+    """Исчезновение считается по переданному моменту кадра."""
+    det = PresenceDetector(
+        camera_index=0,
+        frame_interval_ms=100,
+        absent_after_sec=5,
+        alpha=1.0,
+        present_th=0.5,
+        absent_th=0.5,
+        show_window=False,
+    )
+    det.process_detection(True, 0.5, 0.5, now=100.0)
+    assert det.state.present and det.state.last_seen == 100.0
+    det.process_detection(False, now=103.0)
+    assert det.state.present
+    det.process_detection(False, now=106.0)
+    assert not det.state.present
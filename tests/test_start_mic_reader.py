@@ -0,0 +1,72 @@
+import queue
+import sys
+import threading
+import types
+
+
+def _import_start(monkeypatch):
+    # Подменяем тяжёлые зависимости до импорта ``start``.
+    dummy_morph = types.SimpleNamespace(parse=lambda self, word: [types.SimpleNamespace(normal_form=word)])
+    monkeypatch.setitem(sys.modules, "pymorphy2", types.SimpleNamespace(MorphAnalyzer=lambda: dummy_morph))
+    sys.modules.setdefault("sounddevice", types.SimpleNamespace())
+    cfg = types.SimpleNamespace(
+        user=types.SimpleNamespace(telegram_user_id=0),
+        telegram=types.SimpleNamespace(token=""),
+    )
+    monkeypatch.setattr("core.config.load_config", lambda: cfg)
+    import start
+
+    return start
+
+
+def test_mic_reader_feeds_queue_and_signals_errors(monkeypatch):
+    start = _import_start(monkeypatch)
+
+    class _Recorder:
+        def __init__(self):
+            self.frames = [[1], [2], [3]]
+
+        def read(self):
+            if not self.frames:
+                raise OSError("device gone")
+            return self.frames.pop(0)
+
+    frames = queue.Queue(maxsize=8)
+    reader = threading.Thread(target=start._mic_reader, args=(_Recorder(), frames))
+    reader.start()
+    reader.join(1)
+    assert [frames.get_nowait() for _ in range(4)] == [[1], [2], [3], None]
+
+
+def test_enqueue_frame_drops_oldest(monkeypatch):
+    start = _import_start(monkeypatch)
+
+    monkeypatch.setattr(start, "_dropped_frames", 0)
+    frames = queue.Queue(maxsize=2)
+    for frame in ("a", "b", "c", "d"):
+        start._enqueue_frame(frames, frame)
+    assert [frames.get_nowait(), frames.get_nowait()] == ["c", "d"]
+    assert start._dropped_frames == 2
+
+
+def test_run_asr_reports_worker_failure(monkeypatch):
+    """Сбой потока распознавания не оставляет основной цикл ждать вечно."""
+    import asyncio
+
+    start = _import_start(monkeypatch)
+
+    def failing_worker():
+        raise ValueError("kaldi failed")
+
+    async def run():
+        commands = asyncio.Queue()
+        worker = threading.Thread(
+            target=start._run_asr,
+            args=(failing_worker, asyncio.get_running_loop(), commands),
+        )
+        worker.start()
+        result = await asyncio.wait_for(commands.get(), 1)
+        worker.join(1)
+        return result
+
+    assert asyncio.run(run()) is None
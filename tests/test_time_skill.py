@@ -0,0 +1,39 @@
+import datetime as dt
+import types
+
+from skills import time_ru
+
+
+def test_format_time_words():
+    assert time_ru._format_time(dt.datetime(2024, 1, 1, 23, 15)) == (
+        "двадцать три часа пятнадцать минут"
+    )
+    assert time_ru._format_time(dt.datetime(2024, 1, 1, 20, 0)) == "двадцать часов ровно"
+    assert time_ru._format_time(dt.datetime(2024, 1, 1, 1, 32)) == (
+        "один час тридцать две минуты"
+    )
+
+
+def test_auto_update_skips_unchanged_minute(monkeypatch):
+    """Повторный вызов в ту же минуту не перерисовывает дисплей."""
+    drawn = []
+    moments = iter(
+        [
+            dt.datetime(2024, 1, 1, 10, 5, 0),
+            dt.datetime(2024, 1, 1, 10, 5, 30),
+            dt.datetime(2024, 1, 1, 10, 6, 0),
+        ]
+    )
+    fake_dt = types.SimpleNamespace(
+        datetime=types.SimpleNamespace(now=lambda: next(moments))
+    )
+    monkeypatch.setattr(time_ru, "_dt", fake_dt)
+    monkeypatch.setattr(time_ru, "_last_display", None)
+    monkeypatch.setattr(
+        time_ru, "get_driver", lambda: types.SimpleNamespace(draw=drawn.append)
+    )
+
+    for _ in range(3):
+        time_ru.auto_update()
+
+    assert [item.payload for item in drawn] == ["01-01 10:05", "01-01 10:06"]
@@ -1,7 +1,10 @@
+import threading
 import time
 import types
 import sys
 
+import pytest
+
 # Заглушка sounddevice, чтобы тесты не требовали PortAudio
 sd_stub = types.SimpleNamespace(play=lambda *a, **k: None, wait=lambda: None, stop=lambda: None)
 sys.modules.setdefault("sounddevice", sd_stub)
@@ -103,3 +106,148 @@ def test_global_stop_stops_timer(monkeypatch):
     assert "b" not in ta._ALERTS
     with get_connection() as conn:
         assert conn.execute("SELECT 1 FROM timers WHERE label='b'").fetchone() is None
+
+
+def test_words_to_number_compound_and_fallback():
+    assert ta._words_to_number("двадцать пять") == 25
+    assert ta._words_to_number("сорок одну") == 41
+    assert ta._words_to_number("пять") == 5
+    # фраза с лишними словами разбирается общим циклом
+    assert ta._words_to_number("на тридцать две минуты") == 32
+    assert ta._words_to_number("пицца") is None
+    # дробное число не разбираем, а не обрезаем до целой части
+    assert ta._words_to_number("1.5") is None
+    assert ta._parse_duration("поставь таймер на 1.5 часа", "таймер") is None
+
+
+def test_scheduler_fires_in_order_and_skips_cancelled(monkeypatch):
+    fired = []
+    done = threading.Event()
+
+    def fake_fire(label, typ):
+        fired.append(label)
+        if label == "last":
+            done.set()
+
+    monkeypatch.setattr(ta, "_fire", fake_fire)
+    ta._schedule(0.05, "last", "timer", save=False)
+    ta._schedule(0.01, "first", "timer", save=False)
+    ta._schedule(0.02, "cancelled", "timer", save=False)
+    ta._TIMERS["cancelled"][0].cancel()
+
+    assert done.wait(2.0)
+    assert fired == ["first", "last"]
+    for label in ("first", "cancelled", "last"):
+        ta._TIMERS.pop(label, None)
+
+
+def test_beep_decodes_alarm_wav_once(monkeypatch):
+    import wave
+
+    opened = []
+    played = []
+    real_open = wave.open
+
+    def counting_open(*args, **kwargs):
+        opened.append(args[0])
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr(wave, "open", counting_open)
+    monkeypatch.setattr(ta, "_alarm_cache", None)
+    monkeypatch.setitem(
+        sys.modules,
+        "sounddevice",
+        types.SimpleNamespace(play=lambda *a, **k: played.append(a), wait=lambda: None),
+    )
+
+    ta._beep()
+    ta._beep()
+
+    assert len(opened) == 1
+    assert len(played) == 2
+    assert played[0][1] == played[1][1]
+
+
+def test_fallback_tone_is_built_once():
+    ta._tone.cache_clear()
+    first = ta._tone(880, 0.2)
+    assert ta._tone(880, 0.2) is first
+    assert len(first) == int(ta._TONE_SAMPLE_RATE * 0.2)
+    assert not first.flags.writeable
+
+
+def test_restore_fires_expired_and_removes_them_in_bulk(monkeypatch):
+    sent = []
+    monkeypatch.setattr(ta, "_user_present", lambda: False)
+    monkeypatch.setattr(ta, "_tg_send", sent.append)
+    monkeypatch.setattr(ta, "_remove_timer", lambda label: pytest.fail("per-row delete"))
+    with get_connection() as conn:
+        conn.execute("DELETE FROM timers")
+        # истекли минуту назад: старше суток записи удаляет чистка БД
+        expired_ts = int(time.time()) - 60
+        conn.executemany(
+            "INSERT INTO timers(label, typ, end_ts) VALUES(?, ?, ?)",
+            [("x", "timer", expired_ts), ("y", "reminder_timer", expired_ts)],
+        )
+    ta._restore_from_db()
+    assert sorted(sent) == ["Напоминание y", "Таймер x сработал"]
+    with get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM timers").fetchone()[0] == 0
+
+
+def test_parse_time_uses_given_now():
+    import datetime as dt
+
+    now = dt.datetime(2024, 1, 1, 10, 0, 0)
+    assert ta._parse_time("разбуди в 7:30 подъём", "будильник", now) == (
+        (21 * 60 + 30) * 60,
+        "подъём",
+    )
+    assert ta._parse_time("напомни в одиннадцать часов", "напоминание", now) == (
+        3600,
+        "напоминание",
+    )
+
+
+def test_parse_duration_compound_numbers_and_labels():
+    assert ta._parse_duration("поставь таймер на двадцать пять минут пицца", "таймер") == (
+        1500,
+        "пицца",
+    )
+    assert ta._parse_duration("напомни мне через десять минут позвонить маме", "напоминание") == (
+        600,
+        "позвонить маме",
+    )
+    assert ta._parse_duration("поставь таймер на 5 минут", "таймер") == (300, "таймер")
+    assert ta._parse_duration("поставь таймер", "таймер") is None
+    # пунктуация из Telegram не мешает распознать единицу
+    assert ta._parse_duration("поставь таймер на 5 мин.", "таймер") == (300, "таймер")
+    assert ta._parse_duration("поставь таймер на 5 минут.", "таймер") == (300, "таймер")
+    assert ta._parse_duration("поставь таймер на 10 минут, пицца", "таймер") == (
+        600,
+        "пицца",
+    )
+    # предлог ищется только отдельным словом, посторонние слова не число
+    assert ta._parse_duration("поставь на кухне таймер через 5 минут", "таймер") == (
+        300,
+        "таймер",
+    )
+    assert ta._parse_duration("она 5 минут назад ушла", "таймер") is None
+    assert ta._parse_duration("весна 5 минут", "таймер") is None
+    assert ta._parse_duration("поставь таймер на кухне 5 минут", "таймер") is None
+
+
+def test_alert_loop_stops_quickly(monkeypatch):
+    beeps: list[float] = []
+    monkeypatch.setattr(ta, "_beep", lambda: beeps.append(time.monotonic()))
+    stop_event = threading.Event()
+    th = threading.Thread(target=ta._alert_loop, args=(stop_event,))
+    th.start()
+    time.sleep(0.3)
+    stop_event.set()
+    started = time.monotonic()
+    th.join(1)
+    assert not th.is_alive()
+    assert time.monotonic() - started < 0.5
+    # за 0.3 с успевает прозвучать только первый сигнал
+    assert len(beeps) == 1
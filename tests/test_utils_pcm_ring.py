@@ -0,0 +1,28 @@
+"""Тесты для ``utils.pcm_ring``."""
+
+from __future__ import annotations
+
+from collections import deque
+
+from utils.pcm_ring import PcmRing
+
+
+def test_pcm_ring_keeps_last_bytes_like_deque() -> None:
+    """Содержимое совпадает с последними кадрами ``deque(maxlen=...)``."""
+    frames = [bytes([i]) * 4 for i in range(10)]
+    ring = PcmRing(12)
+    window: deque[bytes] = deque(maxlen=3)
+    for frame in frames:
+        ring.append(frame)
+        window.append(frame)
+        assert b"".join(ring.chunks()) == b"".join(window)
+    assert len(ring) == 12
+
+
+def test_pcm_ring_clear_and_oversized_frame() -> None:
+    ring = PcmRing(4)
+    ring.append(b"abc")
+    ring.clear()
+    assert ring.chunks() == ()
+    ring.append(b"123456")
+    assert ring.chunks() == (b"3456",)
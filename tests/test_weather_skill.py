@@ -0,0 +1,204 @@
+import threading
+import time
+
+import pytest
+
+from skills import weather_ru
+
+
+class _Resp:
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+_WTTR = {
+    "current_condition": [
+        {"temp_C": "5", "weatherCode": "0", "lang_ru": [{"value": "Ясно"}]}
+    ]
+}
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch):
+    monkeypatch.setattr(weather_ru, "_cache_data", {})
+    monkeypatch.setattr(weather_ru, "_cache_source", "")
+    monkeypatch.setattr(weather_ru, "_cache_fetched_at", 0.0)
+
+
+def test_fetches_share_one_session(monkeypatch):
+    """wttr.in и Open-Meteo запрашиваются через общую сессию."""
+
+    calls = []
+
+    def fake_get(url, timeout):
+        calls.append(url)
+        return _Resp({"ok": True})
+
+    monkeypatch.setattr(weather_ru._session, "get", fake_get)
+    monkeypatch.setattr(weather_ru._rq, "get", None)  # прямой вызов упадёт
+
+    assert weather_ru._fetch_wttr("1", "2") == {"ok": True}
+    assert weather_ru._fetch_openmeteo("1", "2") == {"ok": True}
+    assert calls[0].startswith("https://wttr.in/1,2")
+    assert calls[1].startswith("https://api.open-meteo.com/")
+
+
+def test_concurrent_callers_share_one_refresh(monkeypatch):
+    """Пустой кэш при одновременных вопросах обновляется одним запросом."""
+
+    calls = []
+
+    def slow_fetch(lat, lon, cancel=None):
+        calls.append(1)
+        time.sleep(0.1)
+        return _WTTR
+
+    monkeypatch.setattr(weather_ru, "_fetch_wttr", slow_fetch)
+    answers = []
+    threads = [
+        threading.Thread(target=lambda: answers.append(weather_ru._build_answer()))
+        for _ in range(4)
+    ]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    assert len(calls) == 1
+    assert len(answers) == 4 and len(set(answers)) == 1
+
+
+def test_stale_cache_is_refreshed_and_kept_on_failure(monkeypatch):
+    calls = []
+
+    def fetch(lat, lon, cancel=None):
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("offline")
+        return _WTTR
+
+    def no_openmeteo(lat, lon, cancel=None):
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(weather_ru, "_fetch_wttr", fetch)
+    monkeypatch.setattr(weather_ru, "_fetch_openmeteo", no_openmeteo)
+
+    assert weather_ru._current_for_display() == (5, weather_ru._ICON[0])
+    assert weather_ru._current_for_display() == (5, weather_ru._ICON[0])
+    assert len(calls) == 1  # свежий кэш не обновляется
+
+    # кэш устарел: пробуем обновить, а при ошибке сети отдаём старые данные
+    weather_ru._cache_fetched_at -= weather_ru.CACHE_TTL + 1
+    assert weather_ru._current_for_display() == (5, weather_ru._ICON[0])
+    assert len(calls) == 2
+
+
+def test_slow_wttr_is_hedged_with_openmeteo(monkeypatch):
+    """Если wttr.in тормозит, ответ берётся у Open-Meteo, не дожидаясь его."""
+
+    release = threading.Event()
+    openmeteo_calls = []
+
+    def slow_wttr(lat, lon, cancel=None):
+        release.wait(2)
+        return _WTTR
+
+    def openmeteo(lat, lon, cancel=None):
+        openmeteo_calls.append(1)
+        return {"current": {"temperature_2m": -3, "weather_code": 2}}
+
+    monkeypatch.setattr(weather_ru, "HEDGE_DELAY", 0.01)
+    monkeypatch.setattr(weather_ru, "_fetch_wttr", slow_wttr)
+    monkeypatch.setattr(weather_ru, "_fetch_openmeteo", openmeteo)
+    try:
+        assert weather_ru._current_for_display() == (-3, weather_ru._ICON[2])
+    finally:
+        release.set()
+    assert weather_ru._cache_source == "openmeteo"
+
+    # быстрый wttr.in отвечает сам, Open-Meteo не запрашивается
+    monkeypatch.setattr(weather_ru, "HEDGE_DELAY", 1.0)
+    monkeypatch.setattr(weather_ru, "_fetch_wttr", lambda lat, lon, cancel=None: _WTTR)
+    weather_ru._cache_fetched_at = 0.0
+    weather_ru._cache_data = {}
+    assert weather_ru._current_for_display() == (5, weather_ru._ICON[0])
+    assert len(openmeteo_calls) == 1
+
+
+def test_detect_offset_weekdays_and_dates():
+    import datetime as dt
+
+    today = dt.date.today()
+    tomorrow = today + dt.timedelta(days=1)
+    after = today + dt.timedelta(days=2)
+    assert weather_ru._detect_offset("какая погода завтра") == 1
+    assert weather_ru._detect_offset("погода послезавтра") == 2
+    assert weather_ru._detect_offset(f"погода в {weather_ru.WEEKDAYS_RU[after.weekday()]}") == 2
+    assert weather_ru._detect_offset(f"погода {tomorrow.day}.{tomorrow.month}") == 1
+    assert weather_ru._detect_offset("какая погода") == 0
+
+
+def test_timed_get_retries_transient_errors(monkeypatch):
+    attempts = []
+
+    def flaky_get(url, timeout):
+        attempts.append(timeout)
+        if len(attempts) < 3:
+            raise weather_ru._rq.ConnectTimeout("slow")
+        return _Resp({"ok": True})
+
+    monkeypatch.setattr(weather_ru._session, "get", flaky_get)
+    monkeypatch.setattr(weather_ru, "RETRY_BASE_DELAY", 0.001)
+    assert weather_ru._fetch_wttr("1", "2") == {"ok": True}
+    assert attempts == [weather_ru.WTTR_TIMEOUT] * 3
+
+    attempts.clear()
+
+    def down_get(url, timeout):
+        attempts.append(timeout)
+        raise weather_ru._rq.ConnectionError("down")
+
+    monkeypatch.setattr(weather_ru._session, "get", down_get)
+    with pytest.raises(weather_ru._rq.ConnectionError):
+        weather_ru._fetch_openmeteo("1", "2")
+    assert len(attempts) == weather_ru.RETRY_ATTEMPTS
+
+
+def test_hedge_loser_stops_retrying(monkeypatch):
+    """После выбора победителя проигравший запрос не делает новых попыток."""
+
+    attempts = []
+    finished = threading.Event()
+
+    def get(url, timeout):
+        if "wttr.in" in url:
+            attempts.append(url)
+            time.sleep(0.05)
+            raise weather_ru._rq.ConnectTimeout("slow")
+        return _Resp({"current": {"temperature_2m": 1, "weather_code": 0}})
+
+    real_timed_get = weather_ru._timed_get
+
+    def timed_get(url, timeout, cancel=None):
+        try:
+            return real_timed_get(url, timeout, cancel)
+        finally:
+            if "wttr.in" in url:
+                finished.set()
+
+    monkeypatch.setattr(weather_ru._session, "get", get)
+    monkeypatch.setattr(weather_ru, "_timed_get", timed_get)
+    monkeypatch.setattr(weather_ru, "HEDGE_DELAY", 0.01)
+    monkeypatch.setattr(weather_ru, "RETRY_BASE_DELAY", 0.2)
+
+    assert weather_ru._fetch_any()[1] == "openmeteo"
+    assert finished.wait(2)
+    assert len(attempts) == 1
@@ -7,12 +7,14 @@
 
 from .distributions import normal, uniform
 from .rate_limiter import RateLimiter
+from .pcm_ring import PcmRing
 from .greeting import generate_greeting, process_event
 
 __all__ = [
     "normal",
     "uniform",
     "RateLimiter",
+    "PcmRing",
     "generate_greeting",
     "process_event",
 ]
@@ -0,0 +1,71 @@
+"""Кольцевой буфер последних PCM-данных.
+
+Один заранее выделенный ``bytearray`` и курсор записи вместо очереди
+отдельных ``bytes``: добавление кадра копирует байты на место, а не
+создаёт новый объект, и очистка буфера не освобождает память.
+
+Пример
+======
+
+>>> ring = PcmRing(4)
+>>> ring.append(b"ab")
+>>> ring.append(b"cde")
+>>> ring.chunks()
+(b'bcd', b'e')
+>>> len(ring)
+4
+"""
+
+from __future__ import annotations
+
+
+class PcmRing:
+    """Хранит последние *capacity* байт аудиопотока.
+
+    :param capacity: размер буфера в байтах
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._cursor = 0  # позиция следующей записи
+        self._filled = 0  # сколько байт буфера занято данными
+
+    def __len__(self) -> int:
+        return self._filled
+
+    def append(self, pcm: bytes) -> None:
+        """Дописать *pcm*, вытесняя самые старые данные."""
+        cap = len(self._buf)
+        data = memoryview(pcm)
+        n = len(data)
+        if n >= cap:
+            # Кадр больше буфера — остаётся только его хвост
+            self._view[:] = data[n - cap:]
+            self._cursor, self._filled = 0, cap
+            return
+        end = self._cursor + n
+        if end <= cap:
+            self._view[self._cursor:end] = data
+        else:
+            first = cap - self._cursor
+            self._view[self._cursor:] = data[:first]
+            self._view[:n - first] = data[first:]
+        self._cursor = end % cap
+        self._filled = min(self._filled + n, cap)
+
+    def chunks(self) -> tuple[bytes, ...]:
+        """Вернуть содержимое от старых данных к новым (не более двух кусков)."""
+        if self._filled < len(self._buf):
+            # Буфер ещё не заполнен: данные лежат с начала и до курсора
+            return (bytes(self._view[:self._filled]),) if self._filled else ()
+        head = bytes(self._view[self._cursor:])
+        tail = bytes(self._view[:self._cursor])
+        return (head, tail) if tail else (head,)
+
+    def clear(self) -> None:
+        """Забыть содержимое за O(1), не освобождая память."""
+        self._cursor = 0
+        self._filled = 0